@@ -8,6 +8,9 @@ import os
 import shutil
 from pathlib import Path
 
+# Maximum number of pattern repetitions written in a single call
+WRITE_CHUNK_REPEATS = 64 * 1024
+
 def create_directory_structure(base_path):
     """Create the test directory structure."""
     directories = [
@@ -31,67 +34,74 @@ def create_directory_structure(base_path):
 def create_test_files(base_path):
     """Create test files with specific content."""
 
+    # (relative_path, pattern, repeat_count): content is pattern * repeat_count
     files_to_create = [
         # documents/reports
-        ('documents/reports/report_2024_Q1.pdf', b'PDF Report Q1 ' * 10000),        # Duplicate backup_report_2024_Q1.pdf
-        ('documents/reports/report_2024_Q2.pdf', b'PDF Report Q2 ' * 13000),        # Unique file
-        ('documents/reports/backup_report_2024_Q1.pdf', b'PDF Report Q1 ' * 10000), # Duplicate report_2024_Q1.pdf
+        ('documents/reports/report_2024_Q1.pdf', b'PDF Report Q1 ', 10000),        # Duplicate backup_report_2024_Q1.pdf
+        ('documents/reports/report_2024_Q2.pdf', b'PDF Report Q2 ', 13000),        # Unique file
+        ('documents/reports/backup_report_2024_Q1.pdf', b'PDF Report Q1 ', 10000), # Duplicate report_2024_Q1.pdf
 
         # documents/invoices
-        ('documents/invoices/invoice_001.docx', b'DOCX Invoice 001 ' * 1500),   # Duplicate invoice_002.docx
-        ('documents/invoices/invoice_002.docx', b'DOCX Invoice 001 ' * 1500),   # Duplicate invoice_001.docx
-        ('documents/invoices/template.docx', b'DOCX Template ' * 1200),         # Unique file
+        ('documents/invoices/invoice_001.docx', b'DOCX Invoice 001 ', 1500),   # Duplicate invoice_002.docx
+        ('documents/invoices/invoice_002.docx', b'DOCX Invoice 001 ', 1500),   # Duplicate invoice_001.docx
+        ('documents/invoices/template.docx', b'DOCX Template ', 1200),         # Unique file
 
         # documents/letters
-        ('documents/letters/letter_to_client.txt', b'Dear Client,\nThis is a sample letter.' * 200),        # Duplicate letter_to_client_copy.txt
-        ('documents/letters/letter_to_client_copy.txt', b'Dear Client,\nThis is a sample letter.' * 200),   # Duplicate letter_to_client.txt
+        ('documents/letters/letter_to_client.txt', b'Dear Client,\nThis is a sample letter.', 200),        # Duplicate letter_to_client_copy.txt
+        ('documents/letters/letter_to_client_copy.txt', b'Dear Client,\nThis is a sample letter.', 200),   # Duplicate letter_to_client.txt
 
         # media/images
-        ('media/images/photo_vacation.jpg', b'JPEG Photo Vacation ' * 100000),          # Duplicate photo_vacation_backup.jpg
-        ('media/images/photo_vacation_backup.jpg', b'JPEG Photo Vacation ' * 100000),   # Duplicate photo_vacation.jpg
-        ('media/images/photo_family.png', b'PNG Photo Family ' * 150000),               # Unique file
-        ('media/images/screenshot.png', b'PNG Screenshot ' * 25000),                    # Unique file
+        ('media/images/photo_vacation.jpg', b'JPEG Photo Vacation ', 100000),          # Duplicate photo_vacation_backup.jpg
+        ('media/images/photo_vacation_backup.jpg', b'JPEG Photo Vacation ', 100000),   # Duplicate photo_vacation.jpg
+        ('media/images/photo_family.png', b'PNG Photo Family ', 150000),               # Unique file
+        ('media/images/screenshot.png', b'PNG Screenshot ', 25000),                    # Unique file
 
         # media/videos
-        ('media/videos/tutorial.mp4', b'MP4 Video Tutorial ' * 2500000),          # Duplicate tutorial_archive.mp4
-        ('media/videos/tutorial_archive.mp4', b'MP4 Video Tutorial ' * 2500000),  # Duplicate tutorial.mp4
+        ('media/videos/tutorial.mp4', b'MP4 Video Tutorial ', 2500000),          # Duplicate tutorial_archive.mp4
+        ('media/videos/tutorial_archive.mp4', b'MP4 Video Tutorial ', 2500000),  # Duplicate tutorial.mp4
 
         # media/audio
-        ('media/audio/song1.mp3', b'MP3 Audio Song1 ' * 320000),         # Duplicate song1_backup.mp3
-        ('media/audio/song1_backup.mp3', b'MP3 Audio Song1 ' * 320000),  # Duplicate song1.mp3
+        ('media/audio/song1.mp3', b'MP3 Audio Song1 ', 320000),         # Duplicate song1_backup.mp3
+        ('media/audio/song1_backup.mp3', b'MP3 Audio Song1 ', 320000),  # Duplicate song1.mp3
 
         # code/project_a
-        ('code/project_a/main.py', b'def main():\n    print("Hello World")\n' * 500),   # Duplicate code/project_b/main.py code/project_c/main.py
-        ('code/project_a/utils.py', b'def helper():\n    return True\n' * 400),         # Unique file
-        ('code/project_a/config.json', b'{"version": "1.0", "debug": true}' * 60),      # Duplicate code/project_b/config.json
+        ('code/project_a/main.py', b'def main():\n    print("Hello World")\n', 500),   # Duplicate code/project_b/main.py code/project_c/main.py
+        ('code/project_a/utils.py', b'def helper():\n    return True\n', 400),         # Unique file
+        ('code/project_a/config.json', b'{"version": "1.0", "debug": true}', 60),      # Duplicate code/project_b/config.json
 
         # code/project_b
-        ('code/project_b/main.py', b'def main():\n    print("Hello World")\n' * 500),   # Duplicate code/project_a/main.py code/project_c/main.py
-        ('code/project_b/utils.py', b'def helper():\n    return False\n' * 400),        # Unique file
-        ('code/project_b/config.json', b'{"version": "1.0", "debug": true}' * 60),      # Duplicate code/project_a/config.json code/project_c/config.json
+        ('code/project_b/main.py', b'def main():\n    print("Hello World")\n', 500),   # Duplicate code/project_a/main.py code/project_c/main.py
+        ('code/project_b/utils.py', b'def helper():\n    return False\n', 400),        # Unique file
+        ('code/project_b/config.json', b'{"version": "1.0", "debug": true}', 60),      # Duplicate code/project_a/config.json code/project_c/config.json
 
         # code/project_c
-        ('code/project_c/main.py', b'def main():\n    print("Hello World")\n' * 500),   # Duplicate code/project_a/main.py code/project_b/main.py
-        ('code/project_c/utils.py', b'def helper():\n    return None\n' * 400),        # Unique file
-        ('code/project_c/config.json', b'{"version": "1.0", "debug": true}' * 60),      # Duplicate code/project_a/config.json code/project_b/config.json
+        ('code/project_c/main.py', b'def main():\n    print("Hello World")\n', 500),   # Duplicate code/project_a/main.py code/project_b/main.py
+        ('code/project_c/utils.py', b'def helper():\n    return None\n', 400),        # Unique file
+        ('code/project_c/config.json', b'{"version": "1.0", "debug": true}', 60),      # Duplicate code/project_a/config.json code/project_b/config.json
 
         # code/libraries
-        ('code/libraries/helper.py', b'class Helper:\n    pass\n' * 300),        # Unique file
-        ('code/libraries/helper_v2.py', b'class HelperV2:\n    pass\n' * 350),   # Unique file
+        ('code/libraries/helper.py', b'class Helper:\n    pass\n', 300),        # Unique file
+        ('code/libraries/helper_v2.py', b'class HelperV2:\n    pass\n', 350),   # Unique file
 
         # archive/old_documents
-        ('archive/old_documents/report_2023.pdf', b'PDF Report 2023 ' * 11000),         # Duplicate report_2023_copy.pdf
-        ('archive/old_documents/report_2023_copy.pdf', b'PDF Report 2023 ' * 11000),    # Duplicate report_2023.pdf
+        ('archive/old_documents/report_2023.pdf', b'PDF Report 2023 ', 11000),         # Duplicate report_2023_copy.pdf
+        ('archive/old_documents/report_2023_copy.pdf', b'PDF Report 2023 ', 11000),    # Duplicate report_2023.pdf
 
         # archive/old_media
-        ('archive/old_media/old_photo.jpg', b'JPEG Old Photo ' * 75000),            # Duplicate old_photo_backup.jpg
-        ('archive/old_media/old_photo_backup.jpg', b'JPEG Old Photo ' * 75000),     # Duplicate old_photo.jpg
+        ('archive/old_media/old_photo.jpg', b'JPEG Old Photo ', 75000),            # Duplicate old_photo_backup.jpg
+        ('archive/old_media/old_photo_backup.jpg', b'JPEG Old Photo ', 75000),     # Duplicate old_photo.jpg
     ]
 
-    for relative_path, content in files_to_create:
+    for relative_path, pattern, repeat_count in files_to_create:
         file_path = os.path.join(base_path, relative_path)
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        # Write the content in bounded chunks so large files are never held in memory whole
+        with open(file_path, 'wb', buffering=1 << 20) as f:
+            full_chunks, remainder = divmod(repeat_count, WRITE_CHUNK_REPEATS)
+            if full_chunks:
+                chunk = pattern * WRITE_CHUNK_REPEATS
+                for _ in range(full_chunks):
+                    f.write(chunk)
+            f.write(pattern * remainder)
         print(f"Created: {relative_path}")
 
 def main():
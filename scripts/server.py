@@ -13,13 +13,19 @@ The server listens on http://localhost:1080 and provides:
 Examples:
     File serving: http://localhost:1080/?file_path=/path/to/file.jpg
     File deletion: DELETE http://localhost:1080/?file_path=/path/to/file.txt
+    Batch deletion: POST http://localhost:1080/batch_delete with a JSON array of paths
+    Request log: GET http://localhost:1080/_log
 """
 
 import os
 import sys
 import json
+import collections
 import mimetypes
+import re
+import socketserver
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
 # Import the centralized file manager
@@ -27,6 +33,26 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from file_manager import FileManager
 
 
+# Most recent request log lines, kept in memory instead of printed (see GET /_log)
+_LOG = collections.deque(maxlen=1000)
+
+
+def _log(message):
+    """Record a log line; deque appends are thread-safe, so no lock is taken."""
+    _LOG.append(message)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """HTTP server handling each request in its own thread (http.server only has one from Python 3.7)."""
+    # Do not wait for open connections (e.g. video streams) on Ctrl+C
+    daemon_threads = True
+
+
+def _json_bytes(payload):
+    """Serialize a payload to UTF-8 JSON, keeping non-ASCII characters readable."""
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
 class UnifiedHandler(BaseHTTPRequestHandler):
     """HTTP request handler for file serving and deletion."""
 
@@ -58,29 +84,88 @@ class UnifiedHandler(BaseHTTPRequestHandler):
         '.opus': 'audio/opus',
     }
 
-    def _send_json_response(self, status_code, status, message):
-        """Send a JSON response with proper headers."""
+    # Number of concurrent trash moves for /batch_delete
+    BATCH_DELETE_WORKERS = 8
+
+    # Pre-encoded bodies for the fixed error messages
+    _ERR_MISSING_FILE_PATH = _json_bytes({'status': 'error', 'message': 'Missing file_path parameter'})
+    _ERR_BATCH_BODY = _json_bytes(
+        {'status': 'error', 'message': 'Request body must be a JSON array of file paths'}
+    )
+    _ERR_BATCH_CONTENT_TYPE = _json_bytes(
+        {'status': 'error', 'message': 'Content-Type must be application/json'}
+    )
+
+    def _send_json_bytes(self, status_code, body, allow_cross_origin=True):
+        """Send an already encoded JSON body with proper headers."""
         self.send_response(status_code)
         self.send_header('Content-type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
+        if allow_cross_origin:
+            self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        response = {
-            'status': status,
-            'message': message
-        }
-        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+        self.wfile.write(body)
+
+    def _send_json_response(self, status_code, status, message):
+        """Send a JSON response with proper headers."""
+        self._send_json_bytes(status_code, _json_bytes({'status': status, 'message': message}))
+
+    def _send_json_payload(self, status_code, payload, allow_cross_origin=True):
+        """Send an arbitrary JSON payload with proper headers."""
+        self._send_json_bytes(status_code, _json_bytes(payload), allow_cross_origin)
 
     def _send_error_response(self, status_code, message):
         """Send a JSON error response with proper UTF-8 encoding."""
-        self.send_response(status_code)
-        self.send_header('Content-type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        response = {
-            'status': 'error',
-            'message': message
-        }
-        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+        self._send_json_bytes(status_code, _json_bytes({'status': 'error', 'message': message}))
+
+    def _send_file_body(self, f, offset, count):
+        """
+        Stream `count` bytes of an open file to the client, starting at `offset`.
+
+        socket.sendfile() uses zero-copy os.sendfile() where available and
+        falls back to chunked send() elsewhere, so the file is never loaded
+        into memory as a whole.
+        """
+        self.wfile.flush()
+        # sendfile() rejects a zero count, which happens for empty files
+        if count > 0:
+            self.connection.sendfile(f, offset, count)
+
+    @staticmethod
+    def _parse_range(range_header, file_size):
+        """
+        Parse a single-range "Range: bytes=start-end" header.
+
+        Returns:
+            (start, end) inclusive byte positions for a satisfiable range,
+            None when the header is absent, not understood or invalid (serve the whole file),
+            False when the range lies outside the file (416 response).
+        """
+        if not range_header:
+            return None
+
+        match = _RANGE_PATTERN.fullmatch(range_header.strip())
+        if not match:
+            return None
+
+        start, end = match.groups()
+        if not start:
+            # Suffix range: the last `end` bytes
+            if not end:
+                return None
+            length = min(int(end), file_size)
+            if length == 0:
+                return False
+            return file_size - length, file_size - 1
+
+        start = int(start)
+        if end and int(end) < start:
+            # A last position before the first is invalid, not unsatisfiable:
+            # RFC 9110 says to ignore the header
+            return None
+        end = min(int(end), file_size - 1) if end else file_size - 1
+        if start >= file_size:
+            return False
+        return start, end
 
     def _get_valid_file_path(self):
         """
@@ -96,8 +181,8 @@ class UnifiedHandler(BaseHTTPRequestHandler):
             file_path = params.get('file_path', [None])[0]
 
             if not file_path:
-                self._send_error_response(400, 'Missing file_path parameter')
-                print(f"✗ Missing file_path parameter in request")
+                self._send_json_bytes(400, self._ERR_MISSING_FILE_PATH)
+                _log(f"✗ Missing file_path parameter in request")
                 return None
 
             # Decode the URL-encoded file path (handles UTF-8 correctly)
@@ -108,100 +193,167 @@ class UnifiedHandler(BaseHTTPRequestHandler):
         except Exception as e:
             error_msg = f'Error parsing file path: {str(e)}'
             self._send_error_response(400, error_msg)
-            print(f"✗ {error_msg}")
+            _log(f"✗ {error_msg}")
             return None
 
     def do_DELETE(self):
         """Handle DELETE requests for file deletion."""
-        print("Received DELETE request")
+        _log("Received DELETE request")
         try:
             file_path = self._get_valid_file_path()
             if not file_path:
                 return
 
-            print(f"Attempting to delete file: {file_path}")
+            _log(f"Attempting to delete file: {file_path}")
 
             # Use centralized FileManager for deletion
             success, message = FileManager.move_to_trash(file_path)
 
             if success:
-                print(f"✓ {message}: {file_path}")
+                _log(f"✓ {message}: {file_path}")
                 self._send_json_response(200, 'success', f'{message}: {file_path}')
             else:
-                print(f"✗ {message}")
+                _log(f"✗ {message}")
                 self._send_error_response(500, message)
 
         except Exception as e:
-            print(f"✗ Server error: {str(e)}")
+            _log(f"✗ Server error: {str(e)}")
+            self._send_error_response(500, f'Server error: {str(e)}')
+
+    def do_POST(self):
+        """Handle POST requests for batch file deletion."""
+        _log("Received POST request")
+        try:
+            if urllib.parse.urlparse(self.path).path != '/batch_delete':
+                self._send_error_response(404, f'Unknown endpoint: {self.path}')
+                return
+
+            # A JSON content type forces a CORS preflight: other sites cannot post
+            # a "simple" text/plain request that would delete files
+            if self.headers.get_content_type() != 'application/json':
+                self._send_json_bytes(415, self._ERR_BATCH_CONTENT_TYPE)
+                _log("✗ Batch delete request without JSON content type")
+                return
+
+            content_length = int(self.headers.get('Content-Length', 0))
+            file_paths = json.loads(self.rfile.read(content_length).decode('utf-8'))
+
+            if not isinstance(file_paths, list) or not all(isinstance(p, str) for p in file_paths):
+                self._send_json_bytes(400, self._ERR_BATCH_BODY)
+                return
+
+            _log(f"Attempting to delete {len(file_paths)} files")
+
+            # Trash moves are I/O-bound, run them concurrently; same-named files
+            # get distinct trash names (see FileManager._move_into_directory)
+            with ThreadPoolExecutor(max_workers=self.BATCH_DELETE_WORKERS) as executor:
+                outcomes = list(executor.map(FileManager.move_to_trash, file_paths))
+
+            results = []
+            for file_path, (success, message) in zip(file_paths, outcomes):
+                if success:
+                    _log(f"✓ {message}: {file_path}")
+                else:
+                    _log(f"✗ {message}")
+                results.append({
+                    'path': file_path,
+                    'status': 'success' if success else 'error',
+                    'message': message
+                })
+
+            self._send_json_payload(200, {'results': results})
+
+        except (ValueError, UnicodeDecodeError) as e:
+            _log(f"✗ Invalid batch delete request: {str(e)}")
+            self._send_error_response(400, f'Invalid request body: {str(e)}')
+
+        except Exception as e:
+            _log(f"✗ Server error: {str(e)}")
             self._send_error_response(500, f'Server error: {str(e)}')
 
     def do_GET(self):
         """Handle GET requests for file serving."""
-        print("Received GET request")
+        _log("Received GET request")
         try:
+            if urllib.parse.urlparse(self.path).path == '/_log':
+                # No CORS header: other sites must not read the local paths in the log
+                self._send_json_payload(200, {'log': list(_LOG)}, allow_cross_origin=False)
+                return
+
             file_path = self._get_valid_file_path()
             if not file_path:
                 return
 
-            print(f"Serving file: {file_path}")
+            _log(f"Serving file: {file_path}")
 
             # Validate file exists and is a file
             if not os.path.exists(file_path):
                 self._send_error_response(404, f'File not found: {file_path}')
-                print(f"✗ File not found: {file_path}")
+                _log(f"✗ File not found: {file_path}")
                 return
 
             if not os.path.isfile(file_path):
                 self._send_error_response(400, f'Path is not a file: {file_path}')
-                print(f"✗ Path is not a file: {file_path}")
+                _log(f"✗ Path is not a file: {file_path}")
                 return
 
-            # Get file extension and MIME type
+            # Get MIME type from the file extension (plain text for unknown extensions)
             _, file_ext = os.path.splitext(file_path)
-            mime_type = self.MEDIA_TYPES.get(file_ext.lower())
-
-            if not mime_type:
-                mime_type, _ = mimetypes.guess_type(file_path)
-                if not mime_type:
-                    # Default to plain text for unknown extensions
-                    mime_type = 'text/plain; charset=utf-8'
+            mime_type = _EXT_TO_MIME.get(file_ext.lower(), 'text/plain; charset=utf-8')
 
             # Send file
             try:
                 with open(file_path, 'rb') as f:
-                    file_size = os.path.getsize(file_path)
+                    file_size = os.fstat(f.fileno()).st_size
+
+                    # Honor "Range: bytes=start-end" so video previews only fetch what they play
+                    byte_range = self._parse_range(self.headers.get('Range'), file_size)
+                    if byte_range is False:
+                        self.send_response(416)
+                        self.send_header('Content-Range', f'bytes */{file_size}')
+                        self.send_header('Access-Control-Allow-Origin', '*')
+                        self.end_headers()
+                        _log(f"✗ Unsatisfiable range for: {file_path}")
+                        return
+
+                    if byte_range:
+                        start, end = byte_range
+                        self.send_response(206)
+                        self.send_header('Content-Range', f'bytes {start}-{end}/{file_size}')
+                    else:
+                        start, end = 0, file_size - 1
+                        self.send_response(200)
 
-                    self.send_response(200)
                     self.send_header('Content-type', mime_type)
-                    self.send_header('Content-Length', str(file_size))
+                    self.send_header('Content-Length', str(end - start + 1))
+                    self.send_header('Accept-Ranges', 'bytes')
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.send_header('Cache-Control', 'public, max-age=3600')
                     # Important pour Safari: ajouter Content-Disposition
                     self.send_header('Content-Disposition', 'inline')
                     self.end_headers()
 
-                    f.seek(0)
-                    self.wfile.write(f.read())
+                    self._send_file_body(f, start, end - start + 1)
 
-                    print(f"✓ Served: {file_path} ({mime_type})")
+                    _log(f"✓ Served: {file_path} ({mime_type})")
 
             except PermissionError:
                 self._send_error_response(403, f'Permission denied: {file_path}')
-                print(f"✗ Permission denied: {file_path}")
+                _log(f"✗ Permission denied: {file_path}")
 
             except Exception as e:
                 self._send_error_response(500, f'Error serving file: {str(e)}')
-                print(f"✗ Error serving file: {file_path} - {str(e)}")
+                _log(f"✗ Error serving file: {file_path} - {str(e)}")
 
         except Exception as e:
-            print(f"✗ Server error: {str(e)}")
+            _log(f"✗ Server error: {str(e)}")
             self._send_error_response(500, f'Server error: {str(e)}')
 
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
 
@@ -210,13 +362,23 @@ class UnifiedHandler(BaseHTTPRequestHandler):
         pass
 
 
+# Single byte range, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-500"
+_RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)')
+
+# Extension to MIME type map, built once: media types first, then the system MIME database
+mimetypes.init()
+_EXT_TO_MIME = dict(UnifiedHandler.MEDIA_TYPES)
+for _ext, _mime_type in mimetypes.types_map.items():
+    _EXT_TO_MIME.setdefault(_ext.lower(), _mime_type)
+
+
 def main():
     """Start the unified server."""
     host = 'localhost'
     port = 1080
 
     server_address = (host, port)
-    httpd = HTTPServer(server_address, UnifiedHandler)
+    httpd = ThreadingHTTPServer(server_address, UnifiedHandler)
 
     print("=" * 60)
     print("Unified Server for Duplicate File Finder")
@@ -226,6 +388,8 @@ def main():
     print("\n✓ Available endpoints:")
     print(f"  File serving: GET http://{host}:{port}/?file_path=/path/to/file")
     print(f"  File deletion: DELETE http://{host}:{port}/?file_path=/path/to/file")
+    print(f"  Batch deletion: POST http://{host}:{port}/batch_delete (JSON array of paths)")
+    print(f"  Request log: GET http://{host}:{port}/_log")
 
     print(f"\n✓ Deletion method: {FileManager.get_deletion_method()}")
 
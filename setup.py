@@ -14,6 +14,9 @@ setup(
     install_requires=[
         # Add any dependencies required for your project here
     ],
+    extras_require={
+        'fast': ['blake3', 'xxhash'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: Apache License 2.0',
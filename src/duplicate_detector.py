@@ -1,40 +1,227 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
 class DuplicateDetector:
-    def __init__(self, file_paths_with_hashes):
-        # Structure: {file_path: {'hash': hash_value, 'size': file_size}}
-        self.file_data = file_paths_with_hashes
-        self.duplicates_by_hash = {}
+    # Size of each window read by the partial hash prefilter
+    PARTIAL_HASH_SIZE = 64 * 1024
+    # Files larger than this are sampled at their start, middle and end
+    PARTIAL_SAMPLE_THRESHOLD = 3 * PARTIAL_HASH_SIZE
+    # Same-size pairs below this size are compared byte-for-byte instead of hashed
+    COMPARE_MAX_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, file_sizes, hash_callback, partial_hash_callback=None, max_workers=8,
+                 include_empty=False, compare_callback=None, order_key=None, cached_hash_callback=None):
+        # Structure: {file_size: [file_path, ...]}, filled here and by add_file()
+        self._size_buckets = defaultdict(list)
+        for file_path, file_size in file_sizes.items():
+            self._size_buckets[file_size].append(file_path)
+        # Called as hash_callback(file_path) -> raw digest bytes (or None if unreadable)
+        self.hash_callback = hash_callback
+        # Called as partial_hash_callback(file_path, offset, length) -> raw digest bytes (or None)
+        self.partial_hash_callback = partial_hash_callback
+        # Called as compare_callback(path_a, path_b) -> True/False (or None if unreadable)
+        self.compare_callback = compare_callback
+        # Called as cached_hash_callback(file_path) -> stored digest bytes (or None if not cached);
+        # given when hashes are cached, so that pairs are hashed (and cached) instead of compared
+        self.cached_hash_callback = cached_hash_callback
+        # Called as order_key(file_path) -> sort key approximating on-disk order (e.g. inode)
+        self.order_key = order_key
+        # Number of files hashed concurrently (1 for spinning disks)
+        self.max_workers = max_workers
+        # Empty files are all identical: set aside unless explicitly included
+        self.include_empty = include_empty
+        self.empty_files = []
+        # Number of files never hashed because no other file has their size
+        self.size_unique_count = 0
+        # Number of same-size pairs compared directly instead of hashed
+        self.compared_pair_count = 0
+        # Structure: {file_path: digest} for every file that was actually hashed
+        self.file_hashes = {}
+        # Structure: {group_key: [file_path, ...]}. A group key is the raw digest (bytes)
+        # of hashed files, the size (int) of a pair compared byte-for-byte, or the
+        # path (str) of a file found unique without being hashed.
+        self.duplicates_by_hash = defaultdict(list)
+        # Partitions of duplicates_by_hash, computed once grouping is done
+        self._duplicate_groups = {}
+        self._unique_files = {}
+        self._grouped = False
+
+    def add_file(self, file_path, file_size):
+        """Add a file to group, e.g. as soon as the scanner finds it."""
+        self._size_buckets[file_size].append(file_path)
+        self._grouped = False
+
+    def _bucket_by_size(self):
+        """Return the size buckets, with empty files set aside unless included."""
+        buckets = dict(self._size_buckets)
+        self.empty_files = [] if self.include_empty else buckets.pop(0, [])
+        return buckets
+
+    def _partial_hash(self, file_path, file_size):
+        """Hash the first window of a file, plus its middle and last windows for large files."""
+        window = self.PARTIAL_HASH_SIZE
+        offsets = [0]
+        if file_size > self.PARTIAL_SAMPLE_THRESHOLD:
+            offsets += [file_size // 2 - window // 2, file_size - window]
+
+        digests = []
+        for offset in offsets:
+            digest = self.partial_hash_callback(file_path, offset, window)
+            if digest is None:
+                return None
+            digests.append(digest)
+        return b''.join(digests)
+
+    def _map_in_read_order(self, executor, function, paths, *iterables):
+        """
+        Run executor.map() over files, submitting them sorted by order_key.
+
+        Reading files in (roughly) on-disk order turns random reads into
+        sequential ones. Results are returned in the order of `paths`, so
+        groups keep the order in which files were scanned.
+        """
+        columns = [paths, *iterables]
+        if self.order_key is None:
+            return executor.map(function, *columns)
+
+        order = sorted(range(len(paths)), key=lambda index: self.order_key(paths[index]))
+        results = [None] * len(paths)
+        sorted_columns = [[column[index] for index in order] for column in columns]
+        for index, result in zip(order, executor.map(function, *sorted_columns)):
+            results[index] = result
+        return results
+
+    def _split_by_partial_hash(self, executor, buckets):
+        """Split same-size buckets into sub-buckets of files sharing their partial hash."""
+        paths = [file_path for _, bucket in buckets for file_path in bucket]
+        sizes = [file_size for file_size, bucket in buckets for _ in bucket]
+
+        sub_buckets = defaultdict(list)
+        for file_path, file_size, partial_hash in zip(
+                paths, sizes, self._map_in_read_order(executor, self._partial_hash, paths, sizes)):
+            if partial_hash is None:
+                continue
+            sub_buckets[(file_size, partial_hash)].append(file_path)
+        return sub_buckets.values()
 
     def find_duplicates(self):
-        """Group files by their hash signature."""
-        for file_path, data in self.file_data.items():
-            file_hash = data['hash']
+        """
+        Group files by their hash signature.
 
-            if file_hash not in self.duplicates_by_hash:
-                self.duplicates_by_hash[file_hash] = []
+        Files are bucketed by size first: a file whose size is unique cannot
+        have a duplicate, so it is recorded as unique (keyed by its own path)
+        without ever being hashed. Same-size files are then split on a cheap
+        partial hash, and only files still sharing it get a full hash.
+        When a compare_callback is given, a bucket of exactly two files below
+        COMPARE_MAX_SIZE is compared directly instead: a matching pair is
+        keyed by its size, a differing pair gives two unique files. With a
+        cached_hash_callback, such a pair is grouped by its cached hashes when
+        both are cached, and otherwise hashed like any other bucket so that
+        the next scan finds them in the cache.
+        Hashing runs on a thread pool of `max_workers` threads.
+        Empty files are left out of every group (see get_empty_files) unless
+        `include_empty` is set.
+        Grouping only happens once; later calls return immediately.
+        """
+        if self._grouped:
+            return
 
-            self.duplicates_by_hash[file_hash].append(file_path)
+        self.duplicates_by_hash.clear()
+        self._duplicate_groups.clear()
+        self._unique_files.clear()
+        self.file_hashes.clear()
+        self.size_unique_count = 0
+        self.compared_pair_count = 0
+
+        candidates = []
+        pairs = []
+        partial_buckets = []
+        for file_size, paths in self._bucket_by_size().items():
+            if len(paths) == 1:
+                self.duplicates_by_hash[paths[0]] = [paths[0]]
+                self.size_unique_count += 1
+            elif (self.compare_callback is not None and len(paths) == 2
+                  and file_size < self.COMPARE_MAX_SIZE):
+                # A comparison stops at the first difference and costs no hashing
+                pairs.append((file_size, paths))
+            elif self.partial_hash_callback is None or file_size <= self.PARTIAL_HASH_SIZE:
+                # A partial hash would read the whole file anyway, go straight to the full hash
+                candidates.extend(paths)
+            else:
+                partial_buckets.append((file_size, paths))
+
+        if self.cached_hash_callback is not None:
+            # Comparing files reads them on every scan, hashing them fills the cache
+            for file_size, paths in pairs:
+                cached_hashes = [self.cached_hash_callback(file_path) for file_path in paths]
+                if None in cached_hashes:
+                    # Like any other bucket, the partial hash rules out most mismatches cheaply
+                    if self.partial_hash_callback is None or file_size <= self.PARTIAL_HASH_SIZE:
+                        candidates.extend(paths)
+                    else:
+                        partial_buckets.append((file_size, paths))
+                    continue
+                for file_path, file_hash in zip(paths, cached_hashes):
+                    self.file_hashes[file_path] = file_hash
+                    self.duplicates_by_hash[file_hash].append(file_path)
+            pairs = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for sub_bucket in self._split_by_partial_hash(executor, partial_buckets):
+                if len(sub_bucket) == 1:
+                    self.duplicates_by_hash[sub_bucket[0]] = sub_bucket
+                else:
+                    candidates.extend(sub_bucket)
+
+            first_paths = [paths[0] for _, paths in pairs]
+            second_paths = [paths[1] for _, paths in pairs]
+            for (file_size, paths), identical in zip(
+                    pairs, self._map_in_read_order(executor, self.compare_callback, first_paths, second_paths)):
+                if identical is None:
+                    # Let hashing decide which of the two files is readable
+                    candidates.extend(paths)
+                    continue
+                self.compared_pair_count += 1
+                if identical:
+                    self.duplicates_by_hash[file_size] = list(paths)
+                else:
+                    for file_path in paths:
+                        self.duplicates_by_hash[file_path] = [file_path]
+
+            file_hashes = self._map_in_read_order(executor, self.hash_callback, candidates)
+
+            for file_path, file_hash in zip(candidates, file_hashes):
+                if file_hash is None:
+                    continue
+                assert isinstance(file_hash, bytes), f"hash_callback must return bytes, got {type(file_hash)}"
+                self.file_hashes[file_path] = file_hash
+                self.duplicates_by_hash[file_hash].append(file_path)
+
+        for hash_key, paths in self.duplicates_by_hash.items():
+            if len(paths) > 1:
+                self._duplicate_groups[hash_key] = paths
+            else:
+                self._unique_files[hash_key] = paths
+
+        self._grouped = True
 
     def get_duplicate_groups(self):
         """Return only groups with multiple files (actual duplicates)."""
-        if not self.duplicates_by_hash:
-            self.find_duplicates()
-        return {
-            hash_key: paths 
-            for hash_key, paths in self.duplicates_by_hash.items() 
-            if len(paths) > 1
-        }
+        self.find_duplicates()
+        return self._duplicate_groups
 
     def get_unique_files(self):
         """Return only groups with a single file (unique files)."""
-        if not self.duplicates_by_hash:
-            self.find_duplicates()
-        return {
-            hash_key: paths 
-            for hash_key, paths in self.duplicates_by_hash.items() 
-            if len(paths) == 1
-        }
+        self.find_duplicates()
+        return self._unique_files
+
+    def get_empty_files(self):
+        """Return the zero-byte files left out of grouping."""
+        self.find_duplicates()
+        return self.empty_files
 
     def get_all_groups(self):
         """Return all hash groups."""
         self.find_duplicates()
-        return self.duplicates_by_hash
\ No newline at end of file
+        return dict(self.duplicates_by_hash)
@@ -4,6 +4,7 @@ Centralizes file deletion logic for use in both main.py and server.py
 """
 
 import os
+import shutil
 import sys
 
 try:
@@ -12,6 +13,10 @@ try:
 except ImportError:
     SEND2TRASH_AVAILABLE = False
 
+# Trash directories, resolved once instead of per deleted file
+_MACOS_TRASH = os.path.expanduser('~/.Trash')
+_LINUX_TRASH = os.path.expanduser('~/.local/share/Trash/files')
+
 
 class FileManager:
     """Centralized file management operations."""
@@ -68,15 +73,11 @@ class FileManager:
     def _move_to_macos_trash(file_path):
         """Move file to macOS Trash."""
         try:
-            import subprocess
-            # Use macOS Finder to move to trash
-            subprocess.run([
-                'mv', file_path,
-                os.path.expanduser('~/.Trash/')
-            ], check=True, capture_output=True, timeout=10)
+            if not os.path.isdir(_MACOS_TRASH):
+                return False, "macOS Trash directory not found"
+
+            FileManager._move_into_directory(file_path, _MACOS_TRASH)
             return True, "File moved to macOS Trash"
-        except subprocess.TimeoutExpired:
-            return False, "macOS trash operation timed out"
         except PermissionError:
             return False, f"Permission denied: {file_path}"
         except Exception as e:
@@ -104,24 +105,48 @@ class FileManager:
     def _move_to_linux_trash(file_path):
         """Move file to Linux Trash."""
         try:
-            import subprocess
-            trash_path = os.path.expanduser('~/.local/share/Trash/files')
-            
-            if not os.path.exists(trash_path):
+            if not os.path.isdir(_LINUX_TRASH):
                 return False, "Linux Trash directory not found"
-            
+
             # Move to user's trash
-            subprocess.run([
-                'mv', file_path, trash_path
-            ], check=True, capture_output=True, timeout=10)
+            FileManager._move_into_directory(file_path, _LINUX_TRASH)
             return True, "File moved to Linux Trash"
-        except subprocess.TimeoutExpired:
-            return False, "Linux trash operation timed out"
         except PermissionError:
             return False, f"Permission denied: {file_path}"
         except Exception as e:
             return False, f"Linux trash error: {str(e)}"
 
+    @staticmethod
+    def _move_into_directory(file_path, directory):
+        """
+        Move a file into a directory under a name no other file there uses.
+
+        Duplicates often share a basename, so on collision a " (n)" suffix is
+        added. The target name is reserved with O_CREAT | O_EXCL before the
+        move: concurrent moves of same-named files never overwrite each other.
+
+        Returns:
+            str: Path of the moved file
+        """
+        name, extension = os.path.splitext(os.path.basename(file_path))
+        counter = 0
+        while True:
+            candidate = f"{name} ({counter}){extension}" if counter else name + extension
+            target_path = os.path.join(directory, candidate)
+            try:
+                os.close(os.open(target_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+                break
+            except FileExistsError:
+                counter += 1
+
+        try:
+            # Replaces the empty placeholder, copying across filesystems if needed
+            shutil.move(file_path, target_path)
+        except BaseException:
+            os.remove(target_path)
+            raise
+        return target_path
+
     @staticmethod
     def is_send2trash_available():
         """Check if send2trash library is available."""
@@ -133,7 +158,7 @@ class FileManager:
         if SEND2TRASH_AVAILABLE:
             return "send2trash (cross-platform)"
         elif sys.platform == 'darwin':
-            return "macOS native (mv to ~/.Trash/)"
+            return "macOS native (move to ~/.Trash/)"
         elif sys.platform == 'win32':
             return "Windows native (Recycle Bin)"
         else:
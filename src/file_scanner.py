@@ -1,9 +1,32 @@
+import functools
 import os
+from collections import Counter
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_excluded_name(file_name, excluded_names, excluded_extensions):
+    """
+    Check a file or directory name against the exclusion rules.
+
+    Memoized at module level: names like "src", "index.html" or ".git" repeat
+    throughout real trees, so most checks become a dict lookup.
+    """
+    # Exact matches, hidden system files and directories, then extensions (.pyc, .pyo, etc.)
+    return (file_name in excluded_names
+            or file_name.startswith('.')
+            or file_name.endswith(excluded_extensions))
+
 
 class FileScanner:
     def __init__(self, directories):
         self.directories = directories
         self.file_paths = {}
+        # Structure: {file_path: os.stat_result}, kept so later steps do not stat again
+        self.file_stats = {}
+        # Structure: {directory: file_count}, counted as each root is walked
+        self._summary = Counter()
+        # Errors for unreadable files and directories, reported once the scan is done
+        self.errors = []
         # System files to exclude
         self.excluded_files = {
             '.DS_Store',           # macOS
@@ -19,67 +42,102 @@ class FileScanner:
             '*.pyc',               # Python compiled files
             '*.pyo',               # Python optimized
         }
+        # Split once into exact names and "*.ext" patterns so each check is two lookups
+        self._excluded_names = frozenset(
+            name for name in self.excluded_files if not name.startswith('*.')
+        )
+        self._excluded_extensions = tuple(
+            name[1:] for name in self.excluded_files if name.startswith('*.')
+        )
 
     def scan(self):
         """Scan all directories and populate file_paths."""
-        for directory in self.directories:
-            self._traverse_directory(directory)
+        for _ in self.iter_scan():
+            pass
         return self.file_paths
 
-    def _is_excluded(self, file_path):
-        """Check if file should be excluded from scanning."""
-        file_name = os.path.basename(file_path)
-
-        # Check exact matches
-        if file_name in self.excluded_files:
-            return True
-
-        # Check for system files and directories
-        if file_name.startswith('.'):
-            return True
+    def iter_scan(self):
+        """
+        Scan all directories, yielding (path, stat_result) as each file is found.
 
-        # Check extensions (for .pyc, .pyo, etc.)
-        for excluded in self.excluded_files:
-            if excluded.startswith('*.'):
-                extension = excluded[1:]
-                if file_name.endswith(extension):
-                    return True
+        Each path is yielded once, even when directories overlap or repeat.
 
-        return False
+        file_paths and file_stats are populated along the way, so callers can
+        process files while the walk is still running.
+        """
+        scanned_directories = set()
+        for directory in self.directories:
+            # A repeated root is walked once, so its files are not counted twice
+            if directory in scanned_directories:
+                continue
+            scanned_directories.add(directory)
+            yield from self._traverse_directory(directory)
+
+    def _is_excluded(self, file_name):
+        """Check if a file or directory name should be excluded from scanning."""
+        return _is_excluded_name(file_name, self._excluded_names, self._excluded_extensions)
+
+    def _iter_files(self, directory):
+        """
+        Yield (path, stat_result) for every non-excluded regular file under directory.
+
+        Uses os.scandir so that file types come from the directory listing and each
+        file is stat'ed only once. Directories are visited top-down in listing order,
+        like os.walk. Symbolic links are not followed.
+        """
+        pending_dirs = [directory]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    sub_dirs = []
+                    for entry in entries:
+                        if self._is_excluded(entry.name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                sub_dirs.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                yield entry.path, entry.stat(follow_symlinks=False)
+                        except OSError as e:
+                            self.errors.append(f"Error accessing file {entry.path}: {e}")
+            except OSError as e:
+                self.errors.append(f"Error accessing directory {current_dir}: {e}")
+                continue
+
+            # Reverse so that sub-directories are popped in listing order
+            pending_dirs.extend(reversed(sub_dirs))
 
     def _traverse_directory(self, directory):
         if not os.path.isdir(directory):
             print(f"{directory} is not a valid directory.")
             return
 
-        for root, dirs, files in os.walk(directory):
-            # Filter out excluded directories in-place (prevents descending into them)
-            dirs[:] = [d for d in dirs if not self._is_excluded(os.path.join(root, d))]
-
-            for file in files:
-                file_path = os.path.join(root, file)
-
-                # Skip excluded files
-                if self._is_excluded(file_path):
-                    continue
-
-                try:
-                    file_size = os.path.getsize(file_path)
-                    self.file_paths[file_path] = file_size
-                except (IOError, OSError) as e:
-                    print(f"Error accessing file {file_path}: {e}")
+        for file_path, stat_result in self._iter_files(directory):
+            # Every root counts all files under it, including those a nested or
+            # enclosing root already found, but each path is yielded once
+            self._summary[directory] += 1
+            if file_path in self.file_paths:
+                continue
+            self.file_paths[file_path] = stat_result.st_size
+            self.file_stats[file_path] = stat_result
+            yield file_path, stat_result
 
     def get_file_paths(self):
         """Return dictionary of file paths and their sizes."""
         return self.file_paths
 
+    def get_file_stats(self):
+        """Return dictionary of file paths and their stat results from the scan."""
+        return self.file_stats
+
+    def get_errors(self):
+        """Return the errors collected during the scan."""
+        return self.errors
+
     def get_summary(self):
         """Return count of files per directory."""
-        summary = {}
-        for directory in self.directories:
-            count = sum(1 for path in self.file_paths if path.startswith(directory))
-            summary[directory] = count
-        return summary
+        return {directory: self._summary[directory] for directory in self.directories}
 
 """ une liste complète des fichiers systmes a exclure
         # System files to exclude
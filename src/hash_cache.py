@@ -0,0 +1,84 @@
+"""
+Hash Cache Module for Duplicate File Finder
+Persists computed file hashes so unchanged files are not re-hashed on later scans
+"""
+
+import os
+import sqlite3
+import threading
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'duplicate-file-finder', 'hashes.sqlite'
+)
+
+
+class HashCache:
+    """
+    SQLite sidecar mapping a file's (device, inode) to its hash.
+
+    A stored hash is only returned while the file's mtime, size and the hash
+    algorithm are unchanged. Keying by inode keeps entries valid across
+    renames and moves within a filesystem, and shares them between hard links.
+    """
+
+    # Number of new rows written between two commits
+    COMMIT_INTERVAL = 1000
+    # Bumped whenever the table layout changes; older caches are dropped
+    SCHEMA_VERSION = 3
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_path: Path to the SQLite file
+
+        Raises:
+            sqlite3.Error, OSError: If the cache cannot be opened
+        """
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Hashing threads share the connection, access is serialized by the lock
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        if self._connection.execute('PRAGMA user_version').fetchone()[0] != self.SCHEMA_VERSION:
+            self._connection.execute('DROP TABLE IF EXISTS cache')
+            self._connection.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' dev INTEGER NOT NULL,'
+            ' ino INTEGER NOT NULL,'
+            ' mtime_ns INTEGER NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' algorithm TEXT NOT NULL,'
+            ' hash BLOB NOT NULL,'
+            ' PRIMARY KEY (dev, ino))'
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def get(self, dev, ino, mtime_ns, size, algorithm):
+        """Return the cached hash if the file is unchanged since it was stored, else None."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT hash FROM cache WHERE dev=? AND ino=? AND mtime_ns=? AND size=? AND algorithm=?',
+                (dev, ino, mtime_ns, size, algorithm)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, dev, ino, mtime_ns, size, algorithm, file_hash):
+        """Store a freshly computed hash, committing in batches."""
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache (dev, ino, mtime_ns, size, algorithm, hash) VALUES (?, ?, ?, ?, ?, ?)',
+                (dev, ino, mtime_ns, size, algorithm, file_hash)
+            )
+            self._pending += 1
+            if self._pending >= self.COMMIT_INTERVAL:
+                self._connection.commit()
+                self._pending = 0
+
+    def close(self):
+        """Commit pending rows and close the database."""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
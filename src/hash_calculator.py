@@ -1,14 +1,181 @@
+import filecmp
 import hashlib
+import mmap
+import os
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# posix_fadvise() only exists on POSIX systems
+HAS_FADVISE = hasattr(os, 'posix_fadvise')
+# hashlib.file_digest() (Python 3.11+) runs the read loop in C
+HAS_FILE_DIGEST = hasattr(hashlib, 'file_digest')
+
 
 class HashCalculator:
-    def calculate_hash(self, file_path):
-        """Calculate the SHA-256 hash of a file."""
-        hash_sha256 = hashlib.sha256()
-        try:
-            with open(file_path, 'rb') as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(byte_block)
-            return hash_sha256.hexdigest()
+    # Files above this size are hashed by BLAKE3 through a multithreaded memory map
+    BLAKE3_MMAP_THRESHOLD = 1024 * 1024
+    # Below this size a plain read() is as cheap as setting up a memory map
+    MMAP_THRESHOLD = 1024 * 1024
+    # Read size of the plain read() loop: large reads amortize the per-update() overhead
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache=None):
+        # Optional HashCache used to skip files that are unchanged since the last scan
+        self.cache = cache
+        # Errors for unreadable files, collected from all hashing threads (list.append is atomic)
+        self.errors = []
+        # Paths that could not be hashed; a file can log several errors (e.g. compare, then hash)
+        self.unreadable_files = set()
+
+    def _new_hasher(self):
+        """Return a new hash object: BLAKE3 when available, SHA-256 otherwise."""
+        if BLAKE3_AVAILABLE:
+            return blake3.blake3()
+        return hashlib.sha256()
+
+    def calculate_hash(self, file_path, stat_result=None):
+        """
+        Calculate the hash of a file (BLAKE3 if installed, SHA-256 otherwise).
+
+        When a cache is configured, the hash stored for the file's inode is
+        returned as long as its size and modification time are unchanged.
+        `stat_result` may be passed when the caller already stat'ed the file
+        (e.g. during the scan).
+        """
+        try:
+            if stat_result is None or (self.cache is not None and not stat_result.st_ino):
+                # DirEntry.stat() leaves st_ino at 0 on Windows
+                stat_result = os.stat(file_path)
+            # Some filesystems report no inode numbers, their files cannot be cached
+            use_cache = self.cache is not None and stat_result.st_ino
+            cache_key = self._cache_key(stat_result)
+            if use_cache:
+                cached_hash = self.cache.get(*cache_key)
+                if cached_hash is not None:
+                    return cached_hash
+
+            file_hash = self._hash_file(file_path, stat_result.st_size)
+
+            if use_cache:
+                self.cache.put(*cache_key, file_hash)
+            return file_hash
+        except (IOError, OSError, ValueError) as e:
+            self.errors.append(f"Error reading file {file_path}: {e}")
+            self.unreadable_files.add(file_path)
+            return None
+
+    def get_cached_hash(self, file_path, stat_result=None):
+        """
+        Return the cached hash of a file, or None if it is not cached.
+
+        Never reads the file: only its stat result and the cache are consulted.
+        """
+        if self.cache is None:
+            return None
+        try:
+            if stat_result is None or not stat_result.st_ino:
+                stat_result = os.stat(file_path)
+        except OSError:
+            # Reported when the file is hashed
+            return None
+        if not stat_result.st_ino:
+            return None
+        return self.cache.get(*self._cache_key(stat_result))
+
+    def _cache_key(self, stat_result):
+        """Return the cache lookup arguments for a stat'ed file."""
+        return (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns,
+                stat_result.st_size, self.get_hash_algorithm())
+
+    def _hash_file(self, file_path, file_size):
+        """
+        Read a whole file and return its raw digest.
+
+        Where posix_fadvise() exists, the kernel is told the file is read
+        sequentially, then asked to drop it from the page cache: each file is
+        hashed once, and keeping it cached would evict more useful data.
+        """
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            if HAS_FADVISE:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            if BLAKE3_AVAILABLE and file_size > self.BLAKE3_MMAP_THRESHOLD:
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                hasher.update_mmap(file_path)
+            elif file_size >= self.MMAP_THRESHOLD:
+                hasher = self._new_hasher()
+                self._update_from_mmap(hasher, fd)
+            else:
+                # Unbuffered: reads go straight into the hasher without an extra copy
+                with open(fd, 'rb', buffering=0, closefd=False) as f:
+                    if HAS_FILE_DIGEST:
+                        hasher = hashlib.file_digest(f, self._new_hasher)
+                    else:
+                        hasher = self._new_hasher()
+                        # One buffer reused for every read, sized to the file when it is smaller
+                        buffer = bytearray(min(file_size, self.READ_CHUNK_SIZE) or 1)
+                        view = memoryview(buffer)
+                        while True:
+                            bytes_read = f.readinto(buffer)
+                            if not bytes_read:
+                                break
+                            hasher.update(view[:bytes_read])
+
+            if HAS_FADVISE:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            return hasher.digest()
+        finally:
+            os.close(fd)
+
+    def _update_from_mmap(self, hasher, fd):
+        """Feed a whole open file to the hasher through a read-only memory map."""
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            # madvise() is not available on Windows
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+                mm.madvise(mmap.MADV_WILLNEED)
+            hasher.update(mm)
+
+    def calculate_partial_hash(self, file_path, offset, length):
+        """
+        Calculate the hash of `length` bytes of a file starting at `offset`.
+
+        Partial hashes only pre-filter candidates for the full hash, so the
+        non-cryptographic XXH3 is used when `xxhash` is installed.
+        """
+        hasher = xxhash.xxh3_64() if XXHASH_AVAILABLE else self._new_hasher()
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                f.seek(offset)
+                hasher.update(f.read(length))
+            return hasher.digest()
         except (IOError, OSError) as e:
-            print(f"Error reading file {file_path}: {e}")
-            return None
\ No newline at end of file
+            self.errors.append(f"Error reading file {file_path}: {e}")
+            self.unreadable_files.add(file_path)
+            return None
+
+    def compare_files(self, file_path_a, file_path_b):
+        """Return True if two files have identical contents, False if not, None if unreadable."""
+        try:
+            return filecmp.cmp(file_path_a, file_path_b, shallow=False)
+        except (IOError, OSError) as e:
+            self.errors.append(f"Error comparing files {file_path_a} and {file_path_b}: {e}")
+            return None
+
+    @staticmethod
+    def get_hash_algorithm():
+        """Get the name of the hash algorithm being used."""
+        if BLAKE3_AVAILABLE:
+            return "BLAKE3"
+        return "SHA-256"
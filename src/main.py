@@ -1,12 +1,25 @@
 import argparse
+import os
+import sqlite3
 import time
 import sys
 from file_scanner import FileScanner
 from hash_calculator import HashCalculator
+from hash_cache import HashCache
 from duplicate_detector import DuplicateDetector
 from report_generator import ReportGenerator
 from file_manager import FileManager
 
+# Hashing threads by default: one per core, capped so spinning disks don't thrash
+DEFAULT_THREADS = min(os.cpu_count() or 1, 8)
+
+def positive_int(value):
+    """Argparse type for strictly positive integers."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -29,6 +42,23 @@ def parse_arguments():
         action='store_true',
         help='Automatically delete duplicate files, keeping only the first one found'
     )
+    parser.add_argument(
+        '--threads',
+        type=positive_int,
+        default=DEFAULT_THREADS,
+        metavar='N',
+        help='Number of threads used to hash files (default: CPU count, at most 8; use 1 for hard disk drives)'
+    )
+    parser.add_argument(
+        '--include-empty',
+        action='store_true',
+        help='Report empty (zero-byte) files as duplicates of each other'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or update the hash cache (~/.cache/duplicate-file-finder/hashes.sqlite)'
+    )
     parser.add_argument(
         'directories',
         nargs='+',
@@ -57,6 +87,12 @@ def format_decimal_duration(seconds):
         hours = seconds / 3600
         return f"{hours:.2f}h"
 
+def print_errors(errors):
+    """Write errors collected during a step to stderr in a single call."""
+    if errors:
+        sys.stderr.write(''.join(f"  {error}\n" for error in errors))
+        sys.stderr.flush()
+
 def get_user_input(prompt, valid_responses=None):
     """
     Get user input from the terminal, even if stdout is redirected.
@@ -100,14 +136,14 @@ def get_user_input(prompt, valid_responses=None):
         sys.stderr.write(f"Please run the command interactively or use a shell script.\n")
         return None
 
-def confirm_auto_clean(duplicate_groups, file_data):
+def confirm_auto_clean(duplicate_groups, file_sizes):
     """
     Ask user to confirm auto-clean operation.
     Works even when stdout is redirected to a file.
     
     Args:
-        duplicate_groups: {hash: [file_paths]}
-        file_data: {file_path: {'hash': hash, 'size': size, 'deleted': bool}}
+        duplicate_groups: {group_key: [file_paths]} (see DuplicateDetector.duplicates_by_hash)
+        file_sizes: {file_path: size}
     
     Returns:
         bool: True if user confirms, False otherwise
@@ -120,8 +156,8 @@ def confirm_auto_clean(duplicate_groups, file_data):
         # All files except the first one will be deleted
         for file_path in paths[1:]:
             total_files_to_delete += 1
-            if file_path in file_data:
-                total_size_to_delete += file_data[file_path]['size']
+            if file_path in file_sizes:
+                total_size_to_delete += file_sizes[file_path]
     if total_files_to_delete == 0:
         sys.stderr.write("No duplicate files to delete.\n")
         return False
@@ -168,50 +204,82 @@ def main():
     args = parse_arguments()
     directories = args.directories
 
-    # Step 1: Scan all directories for files
+    hash_cache = None
+    if not args.no_cache:
+        try:
+            hash_cache = HashCache()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Hash cache unavailable, hashing all files: {e}")
+
+    hash_calculator = HashCalculator(hash_cache)
+    file_scanner = FileScanner(directories)
+    file_stats = file_scanner.get_file_stats()
+    duplicate_detector = DuplicateDetector(
+        {},
+        lambda file_path: hash_calculator.calculate_hash(file_path, file_stats.get(file_path)),
+        hash_calculator.calculate_partial_hash,
+        max_workers=args.threads,
+        include_empty=args.include_empty,
+        compare_callback=hash_calculator.compare_files,
+        order_key=lambda file_path: (file_stats[file_path].st_dev, file_stats[file_path].st_ino),
+        cached_hash_callback=(
+            None if hash_cache is None
+            else lambda file_path: hash_calculator.get_cached_hash(file_path, file_stats.get(file_path))
+        )
+    )
+
+    # Step 1: Scan all directories for files, bucketing them by size as they are found
     print("Step 1: Scanning directories...")
     step1_start = time.time()
 
-    file_scanner = FileScanner(directories)
-    file_scanner.scan()
+    for file_path, stat_result in file_scanner.iter_scan():
+        duplicate_detector.add_file(file_path, stat_result.st_size)
     file_paths = file_scanner.get_file_paths()
     directory_summary = file_scanner.get_summary()
 
     step1_duration = time.time() - step1_start
+    print_errors(file_scanner.get_errors())
 
     if not file_paths:
+        if hash_cache is not None:
+            hash_cache.close()
         print("No files found in specified directories.")
         return
 
     print(f"  Found {len(file_paths)} files total")
+    if file_scanner.get_errors():
+        print(f"  Skipped {len(file_scanner.get_errors())} unreadable file(s) or directories (see stderr)")
     print(f"  Time: {format_duration(step1_duration)}")
 
-    # Step 2: Calculate hash for each file
+    # Step 2: Calculate hashes, only for files sharing their size and partial hash
     print("\nStep 2: Calculating file hashes...")
+    print(f"  Using hash algorithm: {HashCalculator.get_hash_algorithm()}")
     step2_start = time.time()
 
-    hash_calculator = HashCalculator()
-    file_data = {}
+    duplicate_detector.find_duplicates()
 
-    for file_path, file_size in file_paths.items():
-        file_hash = hash_calculator.calculate_hash(file_path)
-        if file_hash is not None:
-            file_data[file_path] = {
-                'hash': file_hash,
-                'size': file_size,
-                'deleted': False
-            }
+    if hash_cache is not None:
+        hash_cache.close()
 
     step2_duration = time.time() - step2_start
-
-    print(f"  Hashes calculated for {len(file_data)} files")
+    print_errors(hash_calculator.errors)
+
+    print(f"  Hashes calculated for {len(duplicate_detector.file_hashes)} files")
+    if duplicate_detector.size_unique_count:
+        print(f"  Skipped {duplicate_detector.size_unique_count} file(s) with a unique size")
+    if duplicate_detector.compared_pair_count:
+        print(f"  Compared {duplicate_detector.compared_pair_count} same-size file pair(s) byte-for-byte")
+    empty_files = duplicate_detector.get_empty_files()
+    if empty_files:
+        print(f"  Skipped {len(empty_files)} empty file(s) (use --include-empty to report them)")
+    if hash_calculator.unreadable_files:
+        print(f"  Skipped {len(hash_calculator.unreadable_files)} unreadable file(s) (see stderr)")
     print(f"  Time: {format_duration(step2_duration)}")
 
     # Step 3: Detect duplicates
     print("\nStep 3: Detecting duplicates...")
     step3_start = time.time()
 
-    duplicate_detector = DuplicateDetector(file_data)
     duplicate_groups = duplicate_detector.get_duplicate_groups()
     unique_files = duplicate_detector.get_unique_files()
 
@@ -229,16 +297,16 @@ def main():
 
     # Sort once at the beginning if requested
     if not args.no_sort:
-        duplicate_groups = report_generator.sort_duplicates_by_size(duplicate_groups, file_data)
+        duplicate_groups = report_generator.sort_duplicates_by_size(duplicate_groups, file_paths)
 
     step4_duration = time.time() - step4_start
     print(f"  Time: {format_duration(step4_duration)}")
 
     # Step 5: Auto-clean if requested
-    deleted_files = []
+    deleted_files = set()
     if args.auto_clean:
         # Ask for confirmation before proceeding
-        if not confirm_auto_clean(duplicate_groups, file_data):
+        if not confirm_auto_clean(duplicate_groups, file_paths):
             print("Skipping auto-clean and proceeding to report generation...")
             args.auto_clean = False  # Don't mark as auto_clean in reports
             current_step = 5
@@ -249,6 +317,8 @@ def main():
 
             deleted_count = 0
             deleted_size = 0
+            # Printed in one call once the loop is done
+            clean_lines = []
 
             for file_hash, paths in duplicate_groups.items():
                 # Keep the first file, delete the rest
@@ -256,14 +326,15 @@ def main():
                     success, message = FileManager.move_to_trash(file_path)
                     
                     if success:
-                        file_data[file_path]['deleted'] = True
-                        deleted_files.append(file_path)
+                        deleted_files.add(file_path)
                         deleted_count += 1
-                        deleted_size += file_data[file_path]['size']
-                        print(f"  ✓ Deleted: {file_path}")
+                        deleted_size += file_paths[file_path]
+                        clean_lines.append(f"  ✓ Deleted: {file_path}")
                     else:
-                        print(f"  ✗ Error: {message} - {file_path}")
+                        clean_lines.append(f"  ✗ Error: {message} - {file_path}")
 
+            if clean_lines:
+                print("\n".join(clean_lines))
             step5_duration = time.time() - step5_start
             print(f"  Deleted {deleted_count} files ({report_generator._format_size(deleted_size)})")
             print(f"  Time: {format_duration(step5_duration)}")
@@ -279,7 +350,7 @@ def main():
     report = report_generator.generate_report(
         directory_summary,
         duplicate_groups,
-        file_data,
+        file_paths,
         deleted_files if args.auto_clean else None
     )
     print("\n" + report)
@@ -293,14 +364,16 @@ def main():
         print(f"\nStep {current_step + 1}: Generating HTML report...")
         step_html_start = time.time()
 
-        html_report = report_generator.generate_html_report(
-            directory_summary,
-            duplicate_groups,
-            file_data,
-            args.auto_clean
-        )
-        with open(args.html, 'w', encoding='utf-8') as f:
-            f.write(html_report)
+        # Large buffer: the report is written in many small chunks, flushed only on close
+        with open(args.html, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+            report_generator.generate_html_report(
+                directory_summary,
+                duplicate_groups,
+                file_paths,
+                deleted_files,
+                args.auto_clean,
+                output=f
+            )
 
         step_html_duration = time.time() - step_html_start
         print(f"  HTML report saved to: {args.html}")
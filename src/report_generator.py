@@ -1,6 +1,66 @@
+import functools
+import html
+import io
 import os
+import re
+from collections import namedtuple
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import quote
+
+# Template placeholders such as {TIMESTAMP}; CSS and JavaScript braces never match
+_PLACEHOLDER_PATTERN = re.compile(r'\{([A-Z_]+)\}')
+
+# Media file extensions served through the unified server by _get_file_media_url
+_MEDIA_EXT = frozenset({
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff',
+    # Videos
+    '.mp4', '.webm', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.m4v',
+    # Audio
+    '.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus'
+})
+
+_IS_WINDOWS = os.name == 'nt'
+
+
+# Everything the HTML report shows, computed from the scan results before rendering
+_ReportViewModel = namedtuple('_ReportViewModel', [
+    'groups',                 # iterable of (group_num, size_str, [(path, status, url), ...])
+    'total_files',
+    'total_groups',
+    'total_duplicate_files',
+    'deleted_count',
+    'deleted_size',
+])
+
+
+def _server_file_url(file_path):
+    """Return the unified server URL of a file."""
+    # Not memoized: each path is rendered once per report, and abspath() depends on the cwd
+    # Encode the path properly for URL (handles spaces, accents, etc.)
+    encoded_path = quote(os.path.abspath(file_path), safe='')
+    return f'http://localhost:1080/?file_path={encoded_path}'
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_size(size_bytes):
+    """Format bytes to human-readable size, memoized per size."""
+    if size_bytes < 1024:
+        return f"{size_bytes:.2f} B"
+    # Each unit is 2**10 times the previous one: the bit length gives the unit directly
+    unit_index = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.2f} {_SIZE_UNITS[unit_index]}"
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_template(template_path):
+    """Read and split a template once per process, shared by every ReportGenerator."""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return tuple(_PLACEHOLDER_PATTERN.split(f.read()))
 
 
 class ReportGenerator:
@@ -10,22 +70,49 @@ class ReportGenerator:
         self.template = self._load_template()
 
     def _load_template(self):
-        """Load the HTML template from file."""
+        """
+        Load the HTML template from file and compile it.
+
+        The template is split once into alternating literal text and
+        placeholder names, [text, NAME, text, NAME, ..., text], so rendering
+        is a single pass instead of one full-document replace per placeholder.
+        """
         try:
-            with open(self.template_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return _compile_template(self.template_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Template not found at {self.template_path}")
 
-    def generate_report(self, directory_summary, duplicate_groups, file_data, deleted_files=None):
+    def _render_template(self, output, values):
+        """
+        Write the compiled template to output.
+
+        Each placeholder is replaced by its value in `values`: a string, or an
+        iterable of strings written as they are produced. Placeholders without
+        a value are written back unchanged.
+        """
+        for index, part in enumerate(self.template):
+            if index % 2 == 0:
+                output.write(part)
+                continue
+
+            value = values.get(part)
+            if value is None:
+                output.write('{' + part + '}')
+            elif isinstance(value, str):
+                output.write(value)
+            else:
+                output.writelines(value)
+
+    def generate_report(self, directory_summary, duplicate_groups, file_sizes, deleted_files=None):
         """
         Generate a comprehensive text report.
 
         Args:
             directory_summary: {directory: file_count}
-            duplicate_groups: {hash: [file_paths]} (already sorted if needed)
-            file_data: {file_path: {'hash': hash, 'size': size, 'deleted': bool}}
-            deleted_files: List of deleted file paths (if auto-clean was used)
+            duplicate_groups: {group_key: [file_paths]}, keyed by digest bytes or,
+                for pairs compared byte-for-byte, by file size (already sorted if needed)
+            file_sizes: {file_path: size}
+            deleted_files: Set of deleted file paths (if auto-clean was used)
         """
         report_lines = []
 
@@ -38,19 +125,18 @@ class ReportGenerator:
         # Directory scan summary
         report_lines.append("SCAN SUMMARY:")
         report_lines.append("-" * 60)
-        total_files = 0
         for directory, count in directory_summary.items():
             report_lines.append(f"  Directory: {directory}")
             report_lines.append(f"    Files processed: {count}")
-            total_files += count
 
+        # Nested roots count the same files, so the total comes from the distinct paths
         report_lines.append("")
-        report_lines.append(f"Total files processed: {total_files}")
+        report_lines.append(f"Total files processed: {len(file_sizes)}")
         report_lines.append("")
 
         # Auto-clean summary
         if deleted_files:
-            deleted_size = sum(file_data[f]['size'] for f in deleted_files if f in file_data)
+            deleted_size = sum(file_sizes[f] for f in deleted_files if f in file_sizes)
             report_lines.append("AUTO-CLEAN SUMMARY:")
             report_lines.append("-" * 60)
             report_lines.append(f"  Files deleted: {len(deleted_files)}")
@@ -64,167 +150,192 @@ class ReportGenerator:
         if not duplicate_groups:
             report_lines.append("  No duplicate files detected.")
         else:
+            # Local aliases: this loop runs once per duplicate file
+            extend = report_lines.extend
+            deleted = deleted_files or frozenset()
+
+            def format_line(idx, path):
+                if path in deleted:
+                    return f"    - {path} [DELETED]"
+                if idx == 0:
+                    return f"    - {path} [KEPT]"
+                return f"    - {path}"
+
             for group_num, (file_hash, paths) in enumerate(duplicate_groups.items(), 1):
-                report_lines.append(f"  Group {group_num} (Hash: {file_hash[:16]}...):")
-                for idx, path in enumerate(paths):
-                    if file_data and path in file_data and file_data[path].get('deleted'):
-                        report_lines.append(f"    - {path} [DELETED]")
-                    elif idx == 0:
-                        report_lines.append(f"    - {path} [KEPT]")
-                    else:
-                        report_lines.append(f"    - {path}")
-                report_lines.append("")
+                if isinstance(file_hash, bytes):
+                    header = f"  Group {group_num} (Hash: {file_hash.hex()[:16]}...):"
+                else:
+                    # Pairs compared byte-for-byte have no hash
+                    header = f"  Group {group_num} (Identical contents):"
+                extend([header, *[format_line(idx, path) for idx, path in enumerate(paths)], ""])
 
         report_lines.append("=" * 60)
         return "\n".join(report_lines)
 
-    def generate_html_report(self, directory_summary, duplicate_groups, file_data, auto_clean=False):
+    def generate_html_report(self, directory_summary, duplicate_groups, file_sizes,
+                             deleted_files=frozenset(), auto_clean=False, output=None):
         """
-        Generate an HTML report with clickable links to duplicate files.
+        Write an HTML report with clickable links to duplicate files.
+
+        Duplicate groups are rendered and written one at a time, so the whole
+        report is never held in memory when `output` is a file.
 
         Args:
             directory_summary: {directory: file_count}
-            duplicate_groups: {hash: [file_paths]} (already sorted if needed)
-            file_data: {file_path: {'hash': hash, 'size': size, 'deleted': bool}}
+            duplicate_groups: {group_key: [file_paths]}, keyed by digest bytes or,
+                for pairs compared byte-for-byte, by file size (already sorted if needed)
+            file_sizes: {file_path: size}
+            deleted_files: Set of deleted file paths
             auto_clean: Boolean indicating if auto-clean was used
-        """
-        # Generate summary rows
-        summary_rows = self._generate_summary_rows(directory_summary)
-        total_files = sum(directory_summary.values())
-
-        # Generate duplicates content
-        duplicates_content = self._generate_duplicates_content(duplicate_groups, file_data, auto_clean)
-        total_duplicate_groups = len(duplicate_groups)
-        total_duplicate_files = sum(len(paths) - 1 for paths in duplicate_groups.values())
-
-        # Calculate deleted stats
-        deleted_files = [f for f in file_data if file_data[f].get('deleted')]
-        deleted_size = sum(file_data[f]['size'] for f in deleted_files)
-
-        # Fill template placeholders
-        html = self.template
-        html = html.replace('{TIMESTAMP}', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        html = html.replace('{CSS_STYLES}', self._get_css_styles())
-        html = html.replace('{JAVASCRIPT_CODE}', self._get_javascript())
-        html = html.replace('{SUMMARY_ROWS}', summary_rows)
-        html = html.replace('{TOTAL_FILES}', str(total_files))
-        html = html.replace('{DUPLICATE_GROUPS}', str(total_duplicate_groups))
-        html = html.replace('{DUPLICATE_FILES}', str(total_duplicate_files))
-        html = html.replace('{DUPLICATES_CONTENT}', duplicates_content)
-        
-        # Add auto-clean info if applicable
-        if auto_clean:
-            auto_clean_info = f'<p class="auto-clean-info">✓ Auto-clean completed: {len(deleted_files)} files deleted, {self._format_size(deleted_size)} space freed</p>'
-            html = html.replace('{DUPLICATES_CONTENT}', auto_clean_info + '\n' + duplicates_content)
+            output: Text file object the report is written to, or None to
+                return the report as a string
 
-        return html
-
-    def sort_duplicates_by_size(self, duplicate_groups, file_data):
+        Returns:
+            The report as a string when `output` is None, else None
+        """
+        if output is None:
+            buffer = io.StringIO()
+            self.generate_html_report(directory_summary, duplicate_groups, file_sizes,
+                                      deleted_files, auto_clean, output=buffer)
+            return buffer.getvalue()
+
+        view_model = self._prepare_view_model(directory_summary, duplicate_groups, file_sizes, deleted_files)
+
+        def duplicates_content():
+            # Add auto-clean info if applicable
+            if auto_clean:
+                yield f'<p class="auto-clean-info">✓ Auto-clean completed: {view_model.deleted_count} files deleted, {self._format_size(view_model.deleted_size)} space freed</p>\n'
+
+            for group_num, group_html in enumerate(
+                    self._generate_duplicates_content(view_model.groups, auto_clean)):
+                if group_num:
+                    yield '\n'
+                yield group_html
+
+        self._render_template(output, {
+            'TIMESTAMP': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'CSS_STYLES': self._get_css_styles(),
+            'JAVASCRIPT_CODE': self._get_javascript(),
+            'SUMMARY_ROWS': self._generate_summary_rows(directory_summary),
+            'TOTAL_FILES': str(view_model.total_files),
+            'DUPLICATE_GROUPS': str(view_model.total_groups),
+            'DUPLICATE_FILES': str(view_model.total_duplicate_files),
+            'DUPLICATES_CONTENT': duplicates_content(),
+        })
+
+    def sort_duplicates_by_size(self, duplicate_groups, file_sizes):
         """
         Sort duplicate groups by file size in descending order.
         This method is called once in main.py before generating reports.
 
         Args:
-            duplicate_groups: {hash: [file_paths]}
-            file_data: {file_path: {'hash': hash, 'size': size}}
+            duplicate_groups: {group_key: [file_paths]}, keyed by digest bytes or,
+                for pairs compared byte-for-byte, by file size
+            file_sizes: {file_path: size}
 
         Returns:
             Sorted dictionary of duplicate groups by file size (largest first)
         """
-        # Create list of tuples (file_hash, paths, size)
-        groups_with_sizes = []
-
-        for file_hash, paths in duplicate_groups.items():
+        def group_size(group):
             # Get the file size from the first file in the group
-            if paths and paths[0] in file_data:
-                file_size = file_data[paths[0]]['size']
-            else:
-                file_size = 0
-
-            groups_with_sizes.append((file_hash, paths, file_size))
+            paths = group[1]
+            return file_sizes[paths[0]] if paths and paths[0] in file_sizes else 0
 
         # Sort by file size in descending order (largest files first)
-        sorted_groups = sorted(groups_with_sizes, key=lambda x: x[2], reverse=True)
-
-        # Convert back to dictionary format
-        return {file_hash: paths for file_hash, paths, _ in sorted_groups}
+        return dict(sorted(duplicate_groups.items(), key=group_size, reverse=True))
 
     def _generate_summary_rows(self, directory_summary):
         """Generate HTML rows for the summary table."""
-        rows = []
-        for directory, count in directory_summary.items():
-            rows.append(f'                    <tr>')
-            rows.append(f'                        <td>{directory}</td>')
-            rows.append(f'                        <td>{count}</td>')
-            rows.append(f'                    </tr>')
-        return '\n'.join(rows)
-
-    def _generate_duplicates_content(self, duplicate_groups, file_data, auto_clean=False):
-        """Generate HTML content for duplicates section."""
-        if not duplicate_groups:
-            return '            <p class="no-duplicates">No duplicate files detected.</p>'
-
-        groups_html = []
-        for group_num, (file_hash, paths) in enumerate(duplicate_groups.items(), 1):
-            # Get file size
-            if paths and paths[0] in file_data:
-                file_size = file_data[paths[0]]['size']
-                size_str = self._format_size(file_size)
-            else:
-                size_str = "Unknown"
-
-            # Build group HTML
-            group_html = f'            <div class="duplicate-group">\n'
-            group_html += f'                <h3>Group {group_num} • {len(paths)} files • {size_str}</h3>\n'
-            group_html += f'                <ul class="file-list">\n'
+        return '\n'.join(
+            f'                    <tr>\n'
+            f'                        <td>{directory}</td>\n'
+            f'                        <td>{count}</td>\n'
+            f'                    </tr>'
+            for directory, count in directory_summary.items()
+        )
+
+    def _prepare_view_model(self, directory_summary, duplicate_groups, file_sizes, deleted_files):
+        """
+        Compute the report totals and describe each group for rendering.
 
-            # Add file items
-            for idx, path in enumerate(paths):
-                is_deleted = file_data.get(path, {}).get('deleted', False)
-                
-                group_html += f'                    <li'
-                
-                # Add CSS class for deleted files
-                if is_deleted:
-                    group_html += f' class="file-deleted"'
-                elif idx == 0:
-                    group_html += f' class="file-kept"'
-                
-                group_html += f'>\n'
-
-                # Show delete button only if not auto-clean and not deleted
-                if not auto_clean and not is_deleted:
-                    file_url = self._get_file_url(path)
-                    delete_url = self._get_delete_url(path)
-
-                    group_html += f'                        <button class="delete-btn" onclick="deleteFile(\'{self._escape_js_string(path)}\', \'{delete_url}\')" title="Delete file">\n'
-                    group_html += f'                            &#128465;\n'
-                    group_html += f'                        </button>\n'
-                    group_html += f'                        <a href="{file_url}">{path}</a>\n'
+        Totals are computed upfront since they appear above the groups.
+        Groups are described lazily, one at a time as they are rendered, so
+        the whole report is never materialized. Each file gets a status
+        ('deleted', 'kept' or None) and the URL used to open it.
+        """
+        def groups():
+            for group_num, paths in enumerate(duplicate_groups.values(), 1):
+                # Get file size
+                if paths and paths[0] in file_sizes:
+                    size_str = self._format_size(file_sizes[paths[0]])
                 else:
-                    # Show status for deleted/kept files
-                    if is_deleted:
-                        group_html += f'                        <span class="file-status deleted">✓ DELETED</span>\n'
-                        group_html += f'                        <span class="file-path-deleted">{path}</span>\n'
-                    elif idx == 0:
-                        file_url = self._get_file_url(path)
-                        group_html += f'                        <span class="file-status kept">★ KEPT</span>\n'
-                        group_html += f'                        <a href="{file_url}">{path}</a>\n'
+                    size_str = "Unknown"
+
+                files = []
+                for idx, path in enumerate(paths):
+                    if path in deleted_files:
+                        files.append((path, 'deleted', None))
                     else:
-                        group_html += f'                        <span>{path}</span>\n'
+                        files.append((path, 'kept' if idx == 0 else None, self._get_file_url(path)))
+                yield group_num, size_str, files
+
+        return _ReportViewModel(
+            groups=groups(),
+            total_files=len(file_sizes),
+            total_groups=len(duplicate_groups),
+            total_duplicate_files=sum(len(paths) - 1 for paths in duplicate_groups.values()),
+            deleted_count=len(deleted_files),
+            deleted_size=sum(file_sizes[f] for f in deleted_files if f in file_sizes),
+        )
+
+    def _generate_duplicates_content(self, groups, auto_clean=False):
+        """Yield the HTML of the duplicates section, one group at a time."""
+        empty = True
+        for group_num, size_str, files in groups:
+            empty = False
+
+            # Build group HTML from fragments joined once
+            parts = [
+                f'            <div class="duplicate-group">\n',
+                f'                <h3>Group {group_num} • {len(files)} files • {size_str}</h3>\n',
+                f'                <ul class="file-list">\n',
+            ]
 
-                group_html += f'                    </li>\n'
+            # Add file items
+            for path, status, file_url in files:
+                # Add CSS class for deleted and kept files
+                if status == 'deleted':
+                    parts.append(f'                    <li class="file-deleted">\n')
+                elif status == 'kept':
+                    parts.append(f'                    <li class="file-kept">\n')
+                else:
+                    parts.append(f'                    <li>\n')
+
+                if status == 'deleted':
+                    parts.append(f'                        <span class="file-status deleted">✓ DELETED</span>\n')
+                    parts.append(f'                        <span class="file-path-deleted">{path}</span>\n')
+                elif not auto_clean:
+                    # Show delete button; the server serves and deletes files through the same URL.
+                    # Data attributes need HTML escaping only, the (percent-encoded) URL none at all
+                    parts.append(f'                        <button class="delete-btn" data-path="{html.escape(path)}" data-url="{file_url}" onclick="deleteFile(this)" title="Delete file">\n')
+                    parts.append(f'                            &#128465;\n')
+                    parts.append(f'                        </button>\n')
+                    parts.append(f'                        <a href="{file_url}">{path}</a>\n')
+                elif status == 'kept':
+                    parts.append(f'                        <span class="file-status kept">★ KEPT</span>\n')
+                    parts.append(f'                        <a href="{file_url}">{path}</a>\n')
+                else:
+                    parts.append(f'                        <span>{path}</span>\n')
 
-            group_html += f'                </ul>\n'
-            group_html += f'            </div>'
+                parts.append(f'                    </li>\n')
 
-            groups_html.append(group_html)
+            parts.append(f'                </ul>\n')
+            parts.append(f'            </div>')
 
-        return '\n'.join(groups_html)
+            yield ''.join(parts)
 
-    def _escape_js_string(self, string):
-        """Escape special characters for JavaScript strings."""
-        return string.replace("'", "\\'").replace('"', '\\"').replace('\n', '\\n')
+        if empty:
+            yield '            <p class="no-duplicates">No duplicate files detected.</p>'
 
     def _get_css_styles(self):
         """Return additional CSS styles for the HTML report."""
@@ -240,23 +351,16 @@ class ReportGenerator:
         Uses unified server (localhost:1080) for ALL files.
         This ensures compatibility across all browsers (Safari, Firefox, Chrome).
         """
-        abs_path = os.path.abspath(file_path)
-        from urllib.parse import quote
-        
-        # Encode the path properly for URL (handles spaces, accents, etc.)
-        encoded_path = quote(abs_path, safe='')
-        
         # Use unified server for ALL files (not just media)
-        return f'http://localhost:1080/?file_path={encoded_path}'
+        return _server_file_url(file_path)
 
     def _get_file_file_url(self, file_path):
         """Generate a file:// URL for the file path."""
         abs_path = os.path.abspath(file_path)
-        if os.name == 'nt':  # Windows
-            file_url = 'file:///' + abs_path.replace('\\', '/')
-        else:  # macOS/Linux
-            file_url = 'file://' + abs_path
-        return file_url
+        if _IS_WINDOWS:
+            return 'file:///' + abs_path.replace('\\', '/')
+        # macOS/Linux
+        return 'file://' + abs_path
 
     def _get_file_media_url(self, file_path):
         """Generate a URL for the file path.
@@ -265,46 +369,16 @@ class ReportGenerator:
         - Media files (images, videos, audio) via /media endpoint
         - Other files via file:// protocol
         """
-        abs_path = os.path.abspath(file_path)
-
-        # List of media file extensions
-        media_extensions = {
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.bmp', '.tiff',
-            # Videos
-            '.mp4', '.webm', '.mov', '.avi', '.mkv', '.flv', '.wmv', '.m4v',
-            # Audio
-            '.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma', '.opus'
-        }
-
         # Get file extension
         _, file_ext = os.path.splitext(file_path)
 
         # Use unified server for media files
-        if file_ext.lower() in media_extensions:
-            from urllib.parse import quote
-            encoded_path = quote(abs_path, safe='')
-            return f'http://localhost:1080/?file_path={encoded_path}'
+        if file_ext.lower() in _MEDIA_EXT:
+            return _server_file_url(file_path)
 
         # Use file:// protocol for other files
-        if os.name == 'nt':  # Windows
-            file_url = 'file:///' + abs_path.replace('\\', '/')
-        else:  # macOS/Linux
-            file_url = 'file://' + abs_path
-
-        return file_url
-
-    def _get_delete_url(self, file_path):
-        """Generate a delete URL for the unified server endpoint."""
-        abs_path = os.path.abspath(file_path)
-        from urllib.parse import quote
-        encoded_path = quote(abs_path, safe='')
-        return f'http://localhost:1080/?file_path={encoded_path}'
+        return self._get_file_file_url(file_path)
 
     def _format_size(self, size_bytes):
         """Format bytes to human-readable size."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
\ No newline at end of file
+        return _format_size(size_bytes)
\ No newline at end of file
@@ -5,68 +5,230 @@ class TestDuplicateDetector(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.file_data = {
-            '/path/file1.txt': {'hash': 'hash1', 'size': 1024},
-            '/path/file2.txt': {'hash': 'hash2', 'size': 2048},
-            '/path/file3.txt': {'hash': 'hash1', 'size': 1024},  # Duplicate of file1.txt
-            '/path/file4.txt': {'hash': 'hash1', 'size': 1024},  # Another duplicate of file1.txt
-            '/path/file5.txt': {'hash': 'hash3', 'size': 512},
+        self.file_sizes = {
+            '/path/file1.txt': 1024,
+            '/path/file2.txt': 2048,
+            '/path/file3.txt': 1024,  # Duplicate of file1.txt
+            '/path/file4.txt': 1024,  # Another duplicate of file1.txt
+            '/path/file5.txt': 512,
+            '/path/file6.txt': 512,   # Same size as file5.txt, different content
         }
+        self.file_hashes = {
+            '/path/file1.txt': b'hash1',
+            '/path/file2.txt': b'hash2',
+            '/path/file3.txt': b'hash1',
+            '/path/file4.txt': b'hash1',
+            '/path/file5.txt': b'hash3',
+            '/path/file6.txt': b'hash4',
+        }
+        self.hashed_paths = []
+
+    def _hash_callback(self, file_path):
+        """Fake hash function recording which files were hashed."""
+        self.hashed_paths.append(file_path)
+        return self.file_hashes.get(file_path)
 
     def test_identify_duplicates(self):
         """Test that duplicates are correctly identified."""
-        detector = DuplicateDetector(self.file_data)
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
         duplicates = detector.get_duplicate_groups()
 
         # Should find duplicates only for hash1 (3 files)
         self.assertEqual(len(duplicates), 1)
-        self.assertIn('hash1', duplicates)
-        self.assertEqual(len(duplicates['hash1']), 3)
-        self.assertIn('/path/file1.txt', duplicates['hash1'])
-        self.assertIn('/path/file3.txt', duplicates['hash1'])
-        self.assertIn('/path/file4.txt', duplicates['hash1'])
+        self.assertIn(b'hash1', duplicates)
+        self.assertEqual(len(duplicates[b'hash1']), 3)
+        self.assertIn('/path/file1.txt', duplicates[b'hash1'])
+        self.assertIn('/path/file3.txt', duplicates[b'hash1'])
+        self.assertIn('/path/file4.txt', duplicates[b'hash1'])
+
+    def test_size_unique_files_not_hashed(self):
+        """Test that files with a unique size are never hashed."""
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
+        unique_files = detector.get_unique_files()
+
+        self.assertNotIn('/path/file2.txt', self.hashed_paths)
+        self.assertEqual(len(self.hashed_paths), 5)
+        self.assertEqual(detector.size_unique_count, 1)
+
+        # Size-unique file is still reported as unique
+        self.assertEqual(len(unique_files), 3)
+        self.assertIn(['/path/file2.txt'], unique_files.values())
+
+    def test_partial_hash_prefilter(self):
+        """Test that only files sharing their partial hash get a full hash."""
+        big = 1024 * 1024
+        file_sizes = {
+            '/path/big1.bin': big,
+            '/path/big2.bin': big,   # Same start as big1.bin
+            '/path/big3.bin': big,   # Differs from big1.bin in its first window
+        }
+        partial_hashes = {
+            '/path/big1.bin': b'head',
+            '/path/big2.bin': b'head',
+            '/path/big3.bin': b'other',
+        }
+        self.file_hashes.update({'/path/big1.bin': b'hash5', '/path/big2.bin': b'hash5'})
+        sampled_offsets = []
+
+        def partial_hash_callback(file_path, offset, length):
+            sampled_offsets.append(offset)
+            return partial_hashes[file_path]
+
+        detector = DuplicateDetector(file_sizes, self._hash_callback, partial_hash_callback)
+        duplicates = detector.get_duplicate_groups()
+
+        self.assertEqual(duplicates, {b'hash5': ['/path/big1.bin', '/path/big2.bin']})
+        self.assertEqual(sorted(self.hashed_paths), ['/path/big1.bin', '/path/big2.bin'])
+
+        # Large files are sampled at their start, middle and end
+        window = DuplicateDetector.PARTIAL_HASH_SIZE
+        self.assertEqual(set(sampled_offsets), {0, big // 2 - window // 2, big - window})
+
+    def test_pairs_compared_without_hashing(self):
+        """Test that same-size pairs are compared directly when a compare callback is given."""
+        def compare_callback(file_path_a, file_path_b):
+            return self.file_hashes[file_path_a] == self.file_hashes[file_path_b]
+
+        self.file_sizes['/path/file7.txt'] = 2048
+        self.file_hashes['/path/file7.txt'] = b'hash2'
+
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback, compare_callback=compare_callback)
+        duplicates = detector.get_duplicate_groups()
+
+        # Matching pair is keyed by its size, differing pair gives two unique files
+        self.assertEqual(duplicates[2048], ['/path/file2.txt', '/path/file7.txt'])
+        self.assertIn(['/path/file5.txt'], detector.get_unique_files().values())
+        self.assertEqual(detector.compared_pair_count, 2)
+
+        # Only the group of three is hashed
+        self.assertEqual(sorted(self.hashed_paths), ['/path/file1.txt', '/path/file3.txt', '/path/file4.txt'])
+
+    def test_pairs_use_cached_hashes(self):
+        """Test that with a hash cache, pairs are grouped by cached hashes or hashed, never compared."""
+        compared_pairs = []
+
+        def compare_callback(file_path_a, file_path_b):
+            compared_pairs.append((file_path_a, file_path_b))
+            return True
+
+        # file5.txt and file6.txt are cached, file2.txt and file7.txt are not
+        cached_hashes = {'/path/file5.txt': b'hash3', '/path/file6.txt': b'hash4'}
+        self.file_sizes['/path/file7.txt'] = 2048
+        self.file_hashes['/path/file7.txt'] = b'hash2'
+
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback, compare_callback=compare_callback,
+                                     cached_hash_callback=cached_hashes.get)
+        duplicates = detector.get_duplicate_groups()
+
+        self.assertEqual(compared_pairs, [])
+        self.assertEqual(duplicates[b'hash2'], ['/path/file2.txt', '/path/file7.txt'])
+        self.assertIn(['/path/file5.txt'], detector.get_unique_files().values())
+        self.assertNotIn('/path/file5.txt', self.hashed_paths)
+        self.assertIn('/path/file2.txt', self.hashed_paths)
+
+    def test_uncached_pairs_keep_partial_hash_prefilter(self):
+        """Test that an uncached pair whose partial hashes differ is never fully hashed."""
+        big = 1024 * 1024
+        file_sizes = {'/path/big1.bin': big, '/path/big2.bin': big}
+        partial_hashes = {'/path/big1.bin': b'head', '/path/big2.bin': b'other'}
+
+        detector = DuplicateDetector(file_sizes, self._hash_callback,
+                                     lambda file_path, offset, length: partial_hashes[file_path],
+                                     compare_callback=lambda file_path_a, file_path_b: True,
+                                     cached_hash_callback=lambda file_path: None)
+
+        self.assertEqual(detector.get_duplicate_groups(), {})
+        self.assertEqual(self.hashed_paths, [])
+        self.assertEqual(len(detector.get_unique_files()), 2)
+
+    def test_hashing_follows_order_key(self):
+        """Test that files are hashed in order_key order while groups keep scan order."""
+        inodes = {'/path/file1.txt': 3, '/path/file3.txt': 1, '/path/file4.txt': 2}
+        file_sizes = {file_path: 1024 for file_path in inodes}
+
+        detector = DuplicateDetector(file_sizes, self._hash_callback, max_workers=1, order_key=inodes.get)
+        duplicates = detector.get_duplicate_groups()
+
+        self.assertEqual(self.hashed_paths, ['/path/file3.txt', '/path/file4.txt', '/path/file1.txt'])
+        self.assertEqual(duplicates[b'hash1'], ['/path/file1.txt', '/path/file3.txt', '/path/file4.txt'])
+
+    def test_add_file(self):
+        """Test that files added one at a time are grouped like files given upfront."""
+        detector = DuplicateDetector({}, self._hash_callback)
+        for file_path, file_size in self.file_sizes.items():
+            detector.add_file(file_path, file_size)
+
+        self.assertEqual(len(detector.get_duplicate_groups()[b'hash1']), 3)
+
+        # Adding a file after grouping triggers a new grouping
+        self.file_hashes['/path/file7.txt'] = b'hash2'
+        detector.add_file('/path/file7.txt', 2048)
+        self.assertEqual(detector.get_duplicate_groups()[b'hash2'], ['/path/file2.txt', '/path/file7.txt'])
 
     def test_no_duplicates(self):
         """Test when no duplicates exist."""
-        file_data = {
-            '/path/file1.txt': {'hash': 'hash1', 'size': 1024},
-            '/path/file2.txt': {'hash': 'hash2', 'size': 2048},
-            '/path/file3.txt': {'hash': 'hash3', 'size': 512},
+        file_sizes = {
+            '/path/file1.txt': 1024,
+            '/path/file2.txt': 2048,
+            '/path/file3.txt': 512,
         }
 
-        detector = DuplicateDetector(file_data)
+        detector = DuplicateDetector(file_sizes, self._hash_callback)
         duplicates = detector.get_duplicate_groups()
 
-        # Should find no duplicates
+        # Should find no duplicates and hash nothing
         self.assertEqual(len(duplicates), 0)
+        self.assertEqual(self.hashed_paths, [])
 
     def test_all_groups(self):
         """Test retrieval of all hash groups including non-duplicates."""
-        detector = DuplicateDetector(self.file_data)
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
         all_groups = detector.get_all_groups()
 
-        # Should contain all hashes
-        self.assertEqual(len(all_groups), 3)
-        self.assertIn('hash1', all_groups)
-        self.assertIn('hash2', all_groups)
-        self.assertIn('hash3', all_groups)
+        # Should contain every group: 3 hashed groups and 1 size-unique file
+        self.assertEqual(len(all_groups), 4)
+        self.assertIn(b'hash1', all_groups)
+        self.assertIn(b'hash3', all_groups)
+        self.assertIn(b'hash4', all_groups)
 
         # Verify counts
-        self.assertEqual(len(all_groups['hash1']), 3)
-        self.assertEqual(len(all_groups['hash2']), 1)
-        self.assertEqual(len(all_groups['hash3']), 1)
-
-    def test_single_file_per_hash(self):
-        """Test when each file has unique hash."""
-        file_data = {
-            '/path/unique1.txt': {'hash': 'unique_hash1', 'size': 100},
-            '/path/unique2.txt': {'hash': 'unique_hash2', 'size': 200},
-        }
+        self.assertEqual(len(all_groups[b'hash1']), 3)
+        self.assertEqual(len(all_groups[b'hash3']), 1)
+        self.assertEqual(len(all_groups[b'hash4']), 1)
+
+    def test_grouping_runs_once(self):
+        """Test that repeated getter calls neither re-hash nor duplicate paths."""
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
+        detector.get_duplicate_groups()
+        detector.get_unique_files()
+        all_groups = detector.get_all_groups()
+
+        self.assertEqual(len(self.hashed_paths), 5)
+        self.assertEqual(len(all_groups[b'hash1']), 3)
 
-        detector = DuplicateDetector(file_data)
+    def test_empty_files_skipped(self):
+        """Test that zero-byte files are set aside without hashing unless included."""
+        self.file_sizes.update({'/path/empty1.txt': 0, '/path/empty2.txt': 0})
+        self.file_hashes.update({'/path/empty1.txt': b'empty', '/path/empty2.txt': b'empty'})
+
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
+        self.assertNotIn(b'empty', detector.get_duplicate_groups())
+        self.assertEqual(sorted(detector.get_empty_files()), ['/path/empty1.txt', '/path/empty2.txt'])
+        self.assertNotIn('/path/empty1.txt', self.hashed_paths)
+
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback, include_empty=True)
+        self.assertEqual(len(detector.get_duplicate_groups()[b'empty']), 2)
+        self.assertEqual(detector.get_empty_files(), [])
+
+    def test_unreadable_file_skipped(self):
+        """Test that files whose hash cannot be computed are left out."""
+        self.file_hashes['/path/file4.txt'] = None
+
+        detector = DuplicateDetector(self.file_sizes, self._hash_callback)
         duplicates = detector.get_duplicate_groups()
 
-        self.assertEqual(len(duplicates), 0)
+        self.assertEqual(len(duplicates[b'hash1']), 2)
+        self.assertNotIn('/path/file4.txt', duplicates[b'hash1'])
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
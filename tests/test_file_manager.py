@@ -0,0 +1,58 @@
+import unittest
+import tempfile
+import shutil
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from src.file_manager import FileManager
+
+class TestFileManager(unittest.TestCase):
+
+    def setUp(self):
+        """Create a trash directory and same-named files in separate directories."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.trash_dir = os.path.join(self.temp_dir, 'trash')
+        os.makedirs(self.trash_dir)
+
+        self.file_paths = []
+        for index in range(8):
+            directory = os.path.join(self.temp_dir, f'dir{index}')
+            os.makedirs(directory)
+            file_path = os.path.join(directory, 'photo.jpg')
+            Path(file_path).write_text(f'content {index}')
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _trash_contents(self):
+        """Return the contents of every file in the trash."""
+        return sorted(Path(self.trash_dir, name).read_text() for name in os.listdir(self.trash_dir))
+
+    def test_move_keeps_same_named_files(self):
+        """Test that a file whose name is already in the trash gets a suffix instead of failing."""
+        first = FileManager._move_into_directory(self.file_paths[0], self.trash_dir)
+        second = FileManager._move_into_directory(self.file_paths[1], self.trash_dir)
+
+        self.assertEqual(os.path.basename(first), 'photo.jpg')
+        self.assertEqual(os.path.basename(second), 'photo (1).jpg')
+        self.assertFalse(os.path.exists(self.file_paths[0]))
+        self.assertEqual(self._trash_contents(), ['content 0', 'content 1'])
+
+    def test_concurrent_moves_lose_nothing(self):
+        """Test that concurrent moves of same-named files never overwrite each other."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda path: FileManager._move_into_directory(path, self.trash_dir), self.file_paths))
+
+        self.assertEqual(self._trash_contents(), [f'content {index}' for index in range(8)])
+
+    def test_failed_move_releases_name(self):
+        """Test that a move that fails leaves no placeholder behind."""
+        with self.assertRaises(OSError):
+            FileManager._move_into_directory(os.path.join(self.temp_dir, 'missing.jpg'), self.trash_dir)
+
+        self.assertEqual(os.listdir(self.trash_dir), [])
+
+if __name__ == '__main__':
+    unittest.main()
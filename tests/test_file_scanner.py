@@ -1,6 +1,8 @@
 import unittest
 import tempfile
 import os
+import shutil
+from pathlib import Path
 from src.file_scanner import FileScanner
 
 class TestFileScanner(unittest.TestCase):
@@ -12,37 +14,25 @@ class TestFileScanner(unittest.TestCase):
 
         # Create test files in temp_dir1
         self.test_file1 = os.path.join(self.temp_dir1, 'test1.txt')
-        with open(self.test_file1, 'w') as f:
-            f.write('test content 1')
+        Path(self.test_file1).write_text('test content 1')
 
         self.test_file2 = os.path.join(self.temp_dir1, 'test2.txt')
-        with open(self.test_file2, 'w') as f:
-            f.write('test content 2')
+        Path(self.test_file2).write_text('test content 2')
 
         # Create subdirectory with file in temp_dir1
         sub_dir = os.path.join(self.temp_dir1, 'subdir')
         os.makedirs(sub_dir)
         self.test_file3 = os.path.join(sub_dir, 'test3.txt')
-        with open(self.test_file3, 'w') as f:
-            f.write('test content 3')
+        Path(self.test_file3).write_text('test content 3')
 
         # Create test file in temp_dir2
         self.test_file4 = os.path.join(self.temp_dir2, 'test4.txt')
-        with open(self.test_file4, 'w') as f:
-            f.write('test content 4')
+        Path(self.test_file4).write_text('test content 4')
 
     def tearDown(self):
         """Clean up temporary files."""
-        for file_path in [self.test_file1, self.test_file2, self.test_file3, self.test_file4]:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-
-        sub_dir = os.path.join(self.temp_dir1, 'subdir')
-        if os.path.exists(sub_dir):
-            os.rmdir(sub_dir)
-
-        os.rmdir(self.temp_dir1)
-        os.rmdir(self.temp_dir2)
+        shutil.rmtree(self.temp_dir1, ignore_errors=True)
+        shutil.rmtree(self.temp_dir2, ignore_errors=True)
 
     def test_scan_single_directory(self):
         """Test scanning a single directory."""
@@ -81,6 +71,34 @@ class TestFileScanner(unittest.TestCase):
         self.assertGreater(file_paths[self.test_file2], 0)
         self.assertGreater(file_paths[self.test_file3], 0)
 
+    def test_file_stats(self):
+        """Test that stat results from the scan are kept for every file."""
+        scanner = FileScanner([self.temp_dir1])
+        scanner.scan()
+
+        file_paths = scanner.get_file_paths()
+        file_stats = scanner.get_file_stats()
+
+        self.assertEqual(set(file_stats), set(file_paths))
+        self.assertEqual(file_stats[self.test_file1].st_size, file_paths[self.test_file1])
+        self.assertEqual(file_stats[self.test_file1].st_mtime_ns, os.stat(self.test_file1).st_mtime_ns)
+
+    def test_iter_scan(self):
+        """Test that iter_scan yields each file with its stat result while filling file_paths."""
+        scanner = FileScanner([self.temp_dir1])
+        scanned = dict(scanner.iter_scan())
+
+        self.assertEqual(set(scanned), {self.test_file1, self.test_file2, self.test_file3})
+        self.assertEqual(scanned[self.test_file1].st_size, scanner.get_file_paths()[self.test_file1])
+
+    def test_overlapping_directories(self):
+        """Test that files under nested or repeated roots are yielded only once."""
+        sub_dir = os.path.join(self.temp_dir1, 'subdir')
+        scanner = FileScanner([self.temp_dir1, sub_dir, self.temp_dir1])
+        scanned = [file_path for file_path, _ in scanner.iter_scan()]
+
+        self.assertEqual(sorted(scanned), sorted([self.test_file1, self.test_file2, self.test_file3]))
+
     def test_directory_summary(self):
         """Test that directory summary is correct."""
         scanner = FileScanner([self.temp_dir1, self.temp_dir2])
@@ -96,6 +114,15 @@ class TestFileScanner(unittest.TestCase):
         self.assertEqual(summary[self.temp_dir1], 3)
         self.assertEqual(summary[self.temp_dir2], 1)
 
+    def test_overlapping_directory_summary(self):
+        """Test that each root counts every file under it, even when roots are nested or repeated."""
+        sub_dir = os.path.join(self.temp_dir1, 'subdir')
+        scanner = FileScanner([self.temp_dir1, sub_dir, self.temp_dir1])
+        scanner.scan()
+
+        self.assertEqual(scanner.get_summary(), {self.temp_dir1: 3, sub_dir: 1})
+        self.assertEqual(len(scanner.get_file_paths()), 3)
+
     def test_empty_directory(self):
         """Test scanning an empty directory."""
         empty_dir = tempfile.mkdtemp()
@@ -111,6 +138,23 @@ class TestFileScanner(unittest.TestCase):
         finally:
             os.rmdir(empty_dir)
 
+    def test_excluded_files(self):
+        """Test that system files, hidden files and excluded extensions are skipped."""
+        scan_dir = tempfile.mkdtemp()
+
+        try:
+            os.makedirs(os.path.join(scan_dir, '__pycache__'))
+            kept_file = os.path.join(scan_dir, 'kept.txt')
+            for name in ['kept.txt', 'Thumbs.db', '.hidden', 'module.pyc', os.path.join('__pycache__', 'cached.txt')]:
+                Path(scan_dir, name).write_text('content')
+
+            scanner = FileScanner([scan_dir])
+            scanner.scan()
+
+            self.assertEqual(list(scanner.get_file_paths()), [kept_file])
+        finally:
+            shutil.rmtree(scan_dir)
+
     def test_invalid_directory(self):
         """Test behavior with invalid directory path."""
         invalid_dir = '/nonexistent/path/to/directory'
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import shutil
+import os
+from src.hash_cache import HashCache
+from src.hash_calculator import HashCalculator
+
+class TestHashCache(unittest.TestCase):
+
+    def setUp(self):
+        """Create a cache in a temporary directory and a file to hash."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = HashCache(os.path.join(self.temp_dir, 'cache', 'hashes.sqlite'))
+
+        self.test_file = os.path.join(self.temp_dir, 'test.txt')
+        with open(self.test_file, 'w') as f:
+            f.write('test content')
+
+    def tearDown(self):
+        """Close the cache and remove temporary files."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _cache_key(self, calculator):
+        """Return the cache lookup arguments for the test file."""
+        stat_result = os.stat(self.test_file)
+        return (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns,
+                stat_result.st_size, calculator.get_hash_algorithm())
+
+    def test_get_missing_entry(self):
+        """Test that unknown files are cache misses."""
+        self.assertIsNone(self.cache.get(1, 2, 1, 10, 'SHA-256'))
+
+    def test_put_and_get(self):
+        """Test that a stored hash is returned only for the same inode, mtime, size and algorithm."""
+        self.cache.put(1, 2, 1, 10, 'SHA-256', b'hash1')
+
+        self.assertEqual(self.cache.get(1, 2, 1, 10, 'SHA-256'), b'hash1')
+        self.assertIsNone(self.cache.get(1, 3, 1, 10, 'SHA-256'))
+        self.assertIsNone(self.cache.get(1, 2, 2, 10, 'SHA-256'))
+        self.assertIsNone(self.cache.get(1, 2, 1, 11, 'SHA-256'))
+        self.assertIsNone(self.cache.get(1, 2, 1, 10, 'BLAKE3'))
+
+    def test_calculator_uses_cache(self):
+        """Test that the hash calculator stores hashes and reuses them for unchanged files."""
+        calculator = HashCalculator(self.cache)
+        file_hash = calculator.calculate_hash(self.test_file)
+
+        cache_key = self._cache_key(calculator)
+        self.assertEqual(self.cache.get(*cache_key), file_hash)
+
+        # A cache hit is returned without reading the file again
+        self.cache.put(*cache_key, b'cached')
+        self.assertEqual(calculator.calculate_hash(self.test_file), b'cached')
+
+    def test_get_cached_hash(self):
+        """Test that get_cached_hash returns stored hashes only, without hashing."""
+        calculator = HashCalculator(self.cache)
+        self.assertIsNone(calculator.get_cached_hash(self.test_file))
+
+        file_hash = calculator.calculate_hash(self.test_file)
+        self.assertEqual(calculator.get_cached_hash(self.test_file), file_hash)
+        self.assertIsNone(HashCalculator().get_cached_hash(self.test_file))
+
+    def test_cache_survives_rename(self):
+        """Test that a renamed file keeps its cached hash."""
+        calculator = HashCalculator(self.cache)
+        calculator.calculate_hash(self.test_file)
+        self.cache.put(*self._cache_key(calculator), b'cached')
+
+        renamed_file = os.path.join(self.temp_dir, 'renamed.txt')
+        os.rename(self.test_file, renamed_file)
+
+        self.assertEqual(calculator.calculate_hash(renamed_file), b'cached')
+
+    def test_calculator_rehashes_modified_file(self):
+        """Test that a modified file is hashed again."""
+        calculator = HashCalculator(self.cache)
+        old_hash = calculator.calculate_hash(self.test_file)
+
+        with open(self.test_file, 'w') as f:
+            f.write('modified content')
+
+        self.assertNotEqual(calculator.calculate_hash(self.test_file), old_hash)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,11 +34,11 @@ class TestHashCalculator(unittest.TestCase):
         """Test that hash is calculated correctly."""
         hash_value = self.hash_calculator.calculate_hash(self.temp_file1.name)
 
-        # Hash should be a valid SHA-256 hex string (64 characters)
+        # Hash should be a raw 32-byte digest (SHA-256 or BLAKE3)
         self.assertIsNotNone(hash_value)
         if (hash_value is not None):
-            self.assertEqual(len(hash_value), 64)
-            self.assertTrue(all(c in '0123456789abcdef' for c in hash_value))
+            self.assertIsInstance(hash_value, bytes)
+            self.assertEqual(len(hash_value), 32)
 
     def test_identical_files_same_hash(self):
         """Test that identical files produce the same hash."""
@@ -54,19 +54,44 @@ class TestHashCalculator(unittest.TestCase):
 
         self.assertNotEqual(hash1, hash3)
 
+    def test_partial_hash(self):
+        """Test that partial hashes only depend on the requested byte range."""
+        hash1 = self.hash_calculator.calculate_partial_hash(self.temp_file1.name, 0, 4)
+        hash3 = self.hash_calculator.calculate_partial_hash(self.temp_file3.name, 0, 4)
+        hash3_tail = self.hash_calculator.calculate_partial_hash(self.temp_file3.name, 13, 4)
+
+        # 'test content' and 'different content' share 'tent' but not their first 4 bytes
+        self.assertNotEqual(hash1, hash3)
+        self.assertEqual(self.hash_calculator.calculate_partial_hash(self.temp_file1.name, 8, 4), hash3_tail)
+
+    def test_compare_files(self):
+        """Test byte-for-byte comparison of two files."""
+        self.assertTrue(self.hash_calculator.compare_files(self.temp_file1.name, self.temp_file2.name))
+        self.assertFalse(self.hash_calculator.compare_files(self.temp_file1.name, self.temp_file3.name))
+        self.assertIsNone(self.hash_calculator.compare_files(self.temp_file1.name, '/nonexistent/file.txt'))
+
     def test_nonexistent_file(self):
         """Test handling of nonexistent file."""
         hash_value = self.hash_calculator.calculate_hash('/nonexistent/file.txt')
 
-        # Should return None for nonexistent file
+        # Should return None for nonexistent file and record the error
         self.assertIsNone(hash_value)
+        self.assertEqual(len(self.hash_calculator.errors), 1)
+
+    def test_unreadable_file_counted_once(self):
+        """Test that a file failing both comparison and hashing is one unreadable file."""
+        self.hash_calculator.compare_files(self.temp_file1.name, '/nonexistent/file.txt')
+        self.hash_calculator.calculate_hash('/nonexistent/file.txt')
+
+        self.assertEqual(len(self.hash_calculator.errors), 2)
+        self.assertEqual(self.hash_calculator.unreadable_files, {'/nonexistent/file.txt'})
 
     def test_large_file_hash(self):
         """Test hash calculation for larger file."""
         # Create a larger temporary file
-        large_file = tempfile.NamedTemporaryFile(mode='w', delete=False)
-        large_file.write('x' * 1000000)  # 1MB of data
+        large_file = tempfile.NamedTemporaryFile(delete=False)
         large_file.close()
+        os.truncate(large_file.name, 1000000)  # 1MB sparse file, no data written
 
         try:
             hash_value = self.hash_calculator.calculate_hash(large_file.name)
@@ -74,10 +99,25 @@ class TestHashCalculator(unittest.TestCase):
             # Should successfully hash the large file
             self.assertIsNotNone(hash_value)
             if (hash_value is not None):
-                self.assertEqual(len(hash_value), 64)
+                self.assertEqual(len(hash_value), 32)
         finally:
             os.remove(large_file.name)
 
+    def test_mmap_hash_matches_content(self):
+        """Test that memory-mapped hashing matches hashing the content directly."""
+        data = os.urandom(HashCalculator.MMAP_THRESHOLD * 2)
+        mapped_file = tempfile.NamedTemporaryFile(delete=False)
+        mapped_file.write(data)
+        mapped_file.close()
+
+        try:
+            expected = self.hash_calculator._new_hasher()
+            expected.update(data)
+
+            self.assertEqual(self.hash_calculator.calculate_hash(mapped_file.name), expected.digest())
+        finally:
+            os.remove(mapped_file.name)
+
     def test_binary_file_hash(self):
         """Test hash calculation for binary file."""
         binary_file = tempfile.NamedTemporaryFile(delete=False)
@@ -90,7 +130,7 @@ class TestHashCalculator(unittest.TestCase):
             # Should successfully hash binary file
             self.assertIsNotNone(hash_value)
             if (hash_value is not None):
-                self.assertEqual(len(hash_value), 64)
+                self.assertEqual(len(hash_value), 32)
         finally:
             os.remove(binary_file.name)
 
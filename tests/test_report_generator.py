@@ -0,0 +1,73 @@
+import unittest
+import html
+import io
+import re
+from src.report_generator import ReportGenerator
+
+class TestReportGenerator(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a report with one hashed group and one pair compared byte-for-byte."""
+        self.report_generator = ReportGenerator()
+        self.tricky_path = '/data/it\'s a "quoted" \\ path.txt'
+        self.directory_summary = {'/data': 4}
+        self.duplicate_groups = {
+            b'\x01\x23\x45\x67\x89\xab\xcd\xef\x00': ['/data/a.txt', self.tricky_path],
+            2048: ['/data/b.bin', '/data/c.bin'],
+        }
+        self.file_sizes = {'/data/a.txt': 10, self.tricky_path: 10, '/data/b.bin': 2048, '/data/c.bin': 2048}
+
+    def _strip_timestamp(self, report):
+        """Remove the generation time, which differs between two renderings."""
+        return re.sub(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d', '', report)
+
+    def test_html_report_to_file_object(self):
+        """Test that writing to a file object gives the same report as the string return."""
+        output = io.StringIO()
+        result = self.report_generator.generate_html_report(
+            self.directory_summary, self.duplicate_groups, self.file_sizes, output=output)
+        report = self.report_generator.generate_html_report(
+            self.directory_summary, self.duplicate_groups, self.file_sizes)
+
+        self.assertIsNone(result)
+        self.assertIsInstance(report, str)
+        self.assertEqual(self._strip_timestamp(output.getvalue()), self._strip_timestamp(report))
+        self.assertIn('<div class="duplicate-group">', report)
+
+    def test_html_report_escapes_paths(self):
+        """Test that a path containing quotes and a backslash stays inside its data-path attribute."""
+        report = self.report_generator.generate_html_report(
+            self.directory_summary, self.duplicate_groups, self.file_sizes)
+
+        self.assertIn(f'data-path="{html.escape(self.tricky_path)}"', report)
+        self.assertIn('&quot;quoted&quot;', report)
+        self.assertIn('onclick="deleteFile(this)"', report)
+
+    def test_html_report_marks_deleted_files(self):
+        """Test that deleted files are shown as deleted, without a delete button."""
+        report = self.report_generator.generate_html_report(
+            self.directory_summary, self.duplicate_groups, self.file_sizes,
+            deleted_files={'/data/c.bin'}, auto_clean=True)
+
+        self.assertIn('<span class="file-path-deleted">/data/c.bin</span>', report)
+        self.assertNotIn('delete-btn" data-path', report)
+        self.assertIn('Auto-clean completed: 1 files deleted, 2.00 KB space freed', report)
+
+    def test_text_report_group_headers(self):
+        """Test that hashed groups show their hash and compared pairs show identical contents."""
+        report = self.report_generator.generate_report(
+            self.directory_summary, self.duplicate_groups, self.file_sizes)
+
+        self.assertIn('Group 1 (Hash: 0123456789abcdef...):', report)
+        self.assertIn('Group 2 (Identical contents):', report)
+        self.assertIn('    - /data/b.bin [KEPT]', report)
+        self.assertIn('Total files processed: 4', report)
+
+    def test_no_duplicates(self):
+        """Test that an empty report says no duplicates were found."""
+        report = self.report_generator.generate_html_report(self.directory_summary, {}, self.file_sizes)
+
+        self.assertIn('No duplicate files detected.', report)
+
+if __name__ == '__main__':
+    unittest.main()
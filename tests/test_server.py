@@ -0,0 +1,162 @@
+import unittest
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+# scripts/ is not a package: load the server module from its path
+_SERVER_PATH = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'server.py')
+_spec = importlib.util.spec_from_file_location('server', _SERVER_PATH)
+server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server)
+# The server imports file_manager as a top-level module
+file_manager = sys.modules['file_manager']
+
+class TestBatchDelete(unittest.TestCase):
+
+    def setUp(self):
+        """Start the server on a free port, with the trash in a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.trash_dir = os.path.join(self.temp_dir, 'trash')
+        os.makedirs(self.trash_dir)
+
+        self.file_paths = []
+        for index in range(4):
+            directory = os.path.join(self.temp_dir, f'dir{index}')
+            os.makedirs(directory)
+            file_path = os.path.join(directory, 'photo.jpg')
+            Path(file_path).write_text(f'content {index}')
+            self.file_paths.append(file_path)
+
+        patches = [
+            mock.patch.object(file_manager, 'SEND2TRASH_AVAILABLE', False),
+            mock.patch.object(file_manager, '_LINUX_TRASH', self.trash_dir),
+            mock.patch.object(file_manager, '_MACOS_TRASH', self.trash_dir),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.httpd = server.ThreadingHTTPServer(('localhost', 0), server.UnifiedHandler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f'http://localhost:{self.httpd.server_address[1]}/batch_delete'
+
+    def tearDown(self):
+        """Stop the server and clean up temporary files."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _post(self, body, content_type='application/json'):
+        """POST a body to /batch_delete and return (status, decoded JSON response)."""
+        request = urllib.request.Request(self.url, data=body, method='POST',
+                                         headers={'Content-Type': content_type})
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    @unittest.skipIf(sys.platform == 'win32', "Windows deletes through PowerShell")
+    def test_batch_delete_same_named_files(self):
+        """Test that same-named files deleted in one batch all end up in the trash."""
+        status, payload = self._post(json.dumps(self.file_paths).encode('utf-8'))
+
+        self.assertEqual(status, 200)
+        self.assertEqual([result['status'] for result in payload['results']], ['success'] * 4)
+        self.assertEqual([result['path'] for result in payload['results']], self.file_paths)
+        trashed = sorted(Path(self.trash_dir, name).read_text() for name in os.listdir(self.trash_dir))
+        self.assertEqual(trashed, [f'content {index}' for index in range(4)])
+
+    def test_batch_delete_reports_missing_files(self):
+        """Test that a missing file gives an error result without failing the batch."""
+        missing_path = os.path.join(self.temp_dir, 'missing.jpg')
+        status, payload = self._post(json.dumps([missing_path]).encode('utf-8'))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['results'][0]['status'], 'error')
+
+    def test_batch_delete_requires_json_content_type(self):
+        """Test that a text/plain request, which skips the CORS preflight, deletes nothing."""
+        status, _ = self._post(json.dumps(self.file_paths).encode('utf-8'), content_type='text/plain')
+
+        self.assertEqual(status, 415)
+        self.assertTrue(all(os.path.exists(file_path) for file_path in self.file_paths))
+
+    def test_batch_delete_rejects_invalid_body(self):
+        """Test that a body that is not a JSON array of paths is rejected."""
+        self.assertEqual(self._post(b'{"path": "/tmp/x"}')[0], 400)
+        self.assertEqual(self._post(b'not json')[0], 400)
+
+class TestRequestLog(unittest.TestCase):
+
+    def setUp(self):
+        """Start the server on a free port."""
+        self.httpd = server.ThreadingHTTPServer(('localhost', 0), server.UnifiedHandler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f'http://localhost:{self.httpd.server_address[1]}/_log'
+
+    def tearDown(self):
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def test_log_not_readable_cross_origin(self):
+        """Test that the log is served without a CORS header, so other sites cannot read it."""
+        with urllib.request.urlopen(self.url) as response:
+            self.assertIn('log', json.loads(response.read()))
+            self.assertIsNone(response.headers.get('Access-Control-Allow-Origin'))
+
+class TestParseRange(unittest.TestCase):
+
+    def setUp(self):
+        """Set up the parser under test."""
+        self.parse_range = server.UnifiedHandler._parse_range
+
+    def test_no_range(self):
+        """Test that a missing or malformed header serves the whole file."""
+        self.assertIsNone(self.parse_range(None, 1000))
+        self.assertIsNone(self.parse_range('', 1000))
+        self.assertIsNone(self.parse_range('items=0-10', 1000))
+        self.assertIsNone(self.parse_range('bytes=0-10,20-30', 1000))
+
+    def test_closed_range(self):
+        """Test a start-end range, clamped to the end of the file."""
+        self.assertEqual(self.parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(self.parse_range('bytes=900-5000', 1000), (900, 999))
+
+    def test_open_ended_range(self):
+        """Test a range running to the end of the file."""
+        self.assertEqual(self.parse_range('bytes=100-', 1000), (100, 999))
+
+    def test_suffix_range(self):
+        """Test a range covering the last bytes of the file."""
+        self.assertEqual(self.parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(self.parse_range('bytes=-5000', 1000), (0, 999))
+        self.assertIsNone(self.parse_range('bytes=-', 1000))
+
+    def test_out_of_range(self):
+        """Test that a range starting past the end of the file is unsatisfiable."""
+        self.assertIs(self.parse_range('bytes=1000-', 1000), False)
+        self.assertIs(self.parse_range('bytes=2000-3000', 1000), False)
+        self.assertIs(self.parse_range('bytes=-0', 1000), False)
+
+    def test_reversed_range_ignored(self):
+        """Test that a range ending before it starts is ignored, not rejected."""
+        self.assertIsNone(self.parse_range('bytes=5-3', 1000))
+
+    def test_empty_file(self):
+        """Test that no range of an empty file is satisfiable."""
+        self.assertIs(self.parse_range('bytes=0-', 0), False)
+        self.assertIs(self.parse_range('bytes=-100', 0), False)
+        self.assertIsNone(self.parse_range(None, 0))
+
+if __name__ == '__main__':
+    unittest.main()